@@ -0,0 +1,152 @@
+"""
+共享浏览器
+整个进程只启动一个Chromium，每次爬取创建独立的BrowserContext（开销远小于启动浏览器）
+"""
+import asyncio
+import contextlib
+from typing import AsyncIterator, List, Optional
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright, Route
+
+# 爬取时不需要加载的资源类型
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'stylesheet', 'font', 'media', 'texttrack'})
+# 统计/遥测请求，与页面内容无关
+BLOCKED_URL_KEYWORDS = (
+    'collector.github.com', 'collector.githubapp.com', 'api.github.com/_private/browser/stats',
+    'octocaptcha.com', 'google-analytics.com', 'googletagmanager.com',
+)
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+_playwright: Optional[Playwright] = None
+_browser: Optional[Browser] = None
+_launch_lock = asyncio.Lock()
+
+
+async def get_browser() -> Browser:
+    """获取共享的浏览器，首次调用或浏览器断开后重新启动"""
+    global _playwright, _browser
+    if _browser is not None and _browser.is_connected():
+        return _browser
+
+    async with _launch_lock:
+        if _browser is None or not _browser.is_connected():
+            if _playwright is None:
+                _playwright = await async_playwright().start()
+            # 容器中/dev/shm通常很小，改用/tmp避免渲染进程崩溃
+            _browser = await _playwright.chromium.launch(headless=True, args=['--disable-dev-shm-usage'])
+    return _browser
+
+
+async def _block_heavy_resources(route: Route):
+    """拦截与数据提取无关的资源和统计请求"""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(keyword in request.url for keyword in BLOCKED_URL_KEYWORDS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def new_context(block_resources: bool = False) -> BrowserContext:
+    """在共享浏览器中创建一个独立的上下文，用完后由调用方关闭
+
+    Args:
+        block_resources: 是否拦截图片、样式、字体等资源（只读取DOM时不需要，可显著减少流量；
+            依赖懒加载或页面布局的平台不能开启）
+    """
+    browser = await get_browser()
+    context = await browser.new_context(user_agent=USER_AGENT)
+    if block_resources:
+        await context.route("**/*", _block_heavy_resources)
+    return context
+
+
+class PagePool:
+    """可复用的页面池
+
+    并发任务轮流借用固定数量的页面，每个页面依次goto不同的URL，
+    避免每个用户都新建/关闭页面（每次都要启动和销毁一个渲染进程）。
+    页面在同一个上下文中按需创建，池的大小同时限制了并发数量。
+    """
+
+    def __init__(self, size: int, block_resources: bool = False):
+        self._block_resources = block_resources
+        self._context: Optional[BrowserContext] = None
+        # 信号量限制同时借出的页面数；借用失败时信号量随之释放，等待的任务会接替这个位置
+        self._slots = asyncio.Semaphore(max(1, size))
+        self._idle: List[Page] = []
+        self._lock = asyncio.Lock()
+
+    def _context_usable(self) -> bool:
+        if self._context is None:
+            return False
+        browser = self._context.browser
+        return browser is not None and browser.is_connected()
+
+    async def _drop_context(self, context: BrowserContext):
+        """丢弃已失效的上下文，下次借用时在（可能已重新启动的）浏览器中重新创建"""
+        if self._context is not context:
+            return
+        self._context = None
+        self._idle.clear()
+        with contextlib.suppress(Exception):
+            await context.close()
+
+    async def _get_context(self) -> BrowserContext:
+        async with self._lock:
+            if not self._context_usable():
+                if self._context is not None:
+                    await self._drop_context(self._context)
+                self._context = await new_context(self._block_resources)
+            return self._context
+
+    async def _new_page(self) -> Page:
+        context = await self._get_context()
+        try:
+            return await context.new_page()
+        except Exception:
+            # 上下文已关闭或浏览器已断开，换一个新的上下文再试一次
+            async with self._lock:
+                await self._drop_context(context)
+            context = await self._get_context()
+            return await context.new_page()
+
+    @contextlib.asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """借用一个页面，用完自动归还；没有可用的空闲页面时新建一个"""
+        async with self._slots:
+            page = None
+            if not self._context_usable():
+                # 浏览器已断开，旧上下文中的页面都不能再用
+                self._idle.clear()
+            while self._idle:
+                candidate = self._idle.pop()
+                # 页面崩溃、被关闭或属于已丢弃的上下文时不再使用
+                if not candidate.is_closed() and candidate.context is self._context:
+                    page = candidate
+                    break
+            if page is None:
+                page = await self._new_page()
+            try:
+                yield page
+            finally:
+                if not page.is_closed() and page.context is self._context:
+                    self._idle.append(page)
+
+    async def close(self):
+        """关闭池中所有页面及其上下文"""
+        self._idle.clear()
+        if self._context is not None:
+            await self._context.close()
+            self._context = None
+
+
+async def close_browser():
+    """关闭共享的浏览器和Playwright"""
+    global _playwright, _browser
+    if _browser is not None:
+        await _browser.close()
+        _browser = None
+    if _playwright is not None:
+        await _playwright.stop()
+        _playwright = None
@@ -0,0 +1,47 @@
+"""
+进程内缓存
+带容量上限和过期时间的LRU缓存，接口结果缓存和爬取器共用
+"""
+import time
+from collections import OrderedDict
+
+
+class BoundedTTLCache:
+    """带过期时间的LRU缓存，限制条目数量，避免内存无限增长"""
+
+    def __init__(self, capacity: int = 512, ttl: float = 1800):
+        self.capacity = capacity
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+
+    def put(self, key: str, value):
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str):
+        """读取缓存，过期或不存在时返回None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        timestamp, value = entry
+        if time.monotonic() - timestamp > self.ttl:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def sweep(self) -> int:
+        """清理所有过期条目，返回清理数量"""
+        now = time.monotonic()
+        expired = [key for key, (timestamp, _) in self._entries.items() if now - timestamp > self.ttl]
+        for key in expired:
+            del self._entries[key]
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._entries)
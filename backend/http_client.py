@@ -0,0 +1,39 @@
+"""
+共享HTTP客户端
+整个进程共用一个aiohttp会话和连接池，复用keep-alive连接和DNS缓存
+"""
+from typing import Optional
+
+import aiohttp
+
+_session: Optional[aiohttp.ClientSession] = None
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """获取共享的HTTP会话，首次调用时创建"""
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=10,
+            enable_cleanup_closed=True,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+        )
+        # aiohttp默认发送 Accept-Encoding 并自动解压；安装Brotli后同时支持br编码
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30),
+            headers={
+                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+            },
+        )
+    return _session
+
+
+async def close_session():
+    """关闭共享的HTTP会话"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
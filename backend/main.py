@@ -1,28 +1,55 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, StreamingResponse
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, HttpUrl, BeforeValidator, AfterValidator, field_validator
 import os
 import asyncio
-from urllib.parse import urlparse
 import tempfile
-import uuid
-from typing import Optional, List, Dict, AsyncGenerator
+import pathlib
+from urllib.parse import urlparse, quote, unquote
+import secrets
+import hashlib
+from typing import Optional, List, Dict, AsyncGenerator, Annotated
 from datetime import datetime
-import json
-
-from scrapers.github_two_stage import GitHubTwoStageScraper as GitHubScraper
-from scrapers.twitter import TwitterScraper
-from scrapers.producthunt import ProductHuntScraper
-from scrapers.weibo import WeiboScraper
-from scrapers.hackernews import HackerNewsScraper
-from scrapers.youtube import YouTubeScraper
-from scrapers.reddit import RedditScraper
-from scrapers.medium import MediumScraper
-from scrapers.bilibili import BilibiliScraper
+import time
+import functools
+import logging
+import logging.handlers
+import queue
+import orjson
+import redis.asyncio as aioredis
+
+from http_client import get_session, close_session
+from browser_pool import get_browser, close_browser, PagePool
+from cache import BoundedTTLCache
+from scrapers import (
+    GitHubScraper, TwitterScraper, ProductHuntScraper, WeiboScraper, HackerNewsScraper,
+    YouTubeScraper, RedditScraper, MediumScraper, BilibiliScraper, BaseScraper,
+)
+
+# 日志写入队列，由后台线程负责输出，避免阻塞事件循环
+_log_queue = queue.Queue(-1)
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler, respect_handler_level=True)
+# 日志级别可通过 LOG_LEVEL 调整，如 DEBUG 查看爬取细节、WARNING 只保留异常
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), handlers=[logging.handlers.QueueHandler(_log_queue)])
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="FollowNet API", version="1.0.0")
 
+@app.on_event("startup")
+async def start_log_listener():
+    """启动日志输出线程"""
+    _log_listener.start()
+
+@app.on_event("shutdown")
+async def stop_log_listener():
+    """停止日志输出线程并输出剩余日志"""
+    _log_listener.stop()
+
 # 启用CORS以允许前端访问
 app.add_middleware(
     CORSMiddleware,
@@ -32,12 +59,46 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 压缩较大的JSON响应
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
+MAX_USERS_LIMIT = 500
+
+def _ensure_scheme(value):
+    """用户常直接粘贴 github.com/xxx，缺省补全为 https"""
+    if isinstance(value, str):
+        value = value.strip()
+        if value and '://' not in value:
+            value = f"https://{value}"
+    return value
+
+# 在模型层完成URL校验与规范化，非法输入直接 422，不再进入爬虫；
+# 校验后转回 str，下游的正则匹配、缓存键和 JSON 序列化保持不变
+ScrapeUrl = Annotated[HttpUrl, BeforeValidator(_ensure_scheme), AfterValidator(str)]
+
 class ScrapeRequest(BaseModel):
-    url: str
-    page: Optional[int] = 1  # 添加页码参数
-    max_users: Optional[int] = 10  # 添加最大用户数参数
+    url: ScrapeUrl
+    page: int = 1  # 添加页码参数
+    max_users: int = 10  # 添加最大用户数参数
+    max_pages: int = 1  # 从page开始连续爬取的页数（并发爬取）
     stage: Optional[str] = "full"  # 阶段模式：'full'(完整), 'users_only'(仅用户列表), 'details_only'(仅详细信息)
 
+    @field_validator('page')
+    @classmethod
+    def _clamp_page(cls, v: int) -> int:
+        return max(v, 1)
+
+    @field_validator('max_users')
+    @classmethod
+    def _cap_max_users(cls, v: int) -> int:
+        # 限制单次请求的爬取量，避免超大 max_users 拖垮服务
+        return min(max(v, 1), MAX_USERS_LIMIT)
+
+    @field_validator('max_pages')
+    @classmethod
+    def _clamp_max_pages(cls, v: int) -> int:
+        return min(max(v, 1), MAX_PAGES_PER_REQUEST)
+
 class ScrapeResponse(BaseModel):
     success: bool
     message: str
@@ -58,8 +119,8 @@ class BatchDetailsRequest(BaseModel):
     original_owner: str  # 原始仓库的owner
     original_repo: str   # 原始仓库名
 
-# 全局会话管理
-streaming_sessions = {}
+# 全局会话管理：本进程正在执行的流式会话（配置Redis时状态同步到Redis，控制指令经频道转发）
+streaming_sessions: Dict[str, 'StreamingSession'] = {}
 
 class StreamingSession:
     def __init__(self, session_id: str, request: ScrapeRequest):
@@ -70,105 +131,360 @@ class StreamingSession:
         self.is_running = False
         self.progress_generator = None
         self.current_data = []
+        # 未暂停时处于set状态，暂停时clear，流式生成器据此等待而无需轮询
+        self._resumed = asyncio.Event()
+        self._resumed.set()
 
     def pause(self):
         self.is_paused = True
+        self._resumed.clear()
 
     def resume(self):
         self.is_paused = False
+        self._resumed.set()
 
     def stop(self):
         self.is_stopped = True
         self.is_running = False
+        self._resumed.set()
+
+    def apply(self, action: str) -> bool:
+        """执行控制操作，返回操作是否有效"""
+        handler = {'pause': self.pause, 'resume': self.resume, 'stop': self.stop}.get(action)
+        if handler is None:
+            return False
+        handler()
+        return True
+
+    async def wait_if_paused(self):
+        await self._resumed.wait()
+
+    def status(self) -> Dict:
+        return {
+            "is_running": self.is_running,
+            "is_paused": self.is_paused,
+            "is_stopped": self.is_stopped,
+            "data_count": len(self.current_data),
+        }
+
+# 注册域名与平台的对应关系
+_REGISTERED_DOMAINS = {
+    'github.com': 'github',
+    'twitter.com': 'twitter',
+    'x.com': 'twitter',
+    'producthunt.com': 'producthunt',
+    'weibo.com': 'weibo',
+    'news.ycombinator.com': 'hackernews',
+    'youtube.com': 'youtube',
+    'youtu.be': 'youtube',
+    'reddit.com': 'reddit',
+    'medium.com': 'medium',
+    'bilibili.com': 'bilibili',
+}
+
+# 平台对应的爬取器类
+SCRAPER_FACTORIES = {
+    'github': GitHubScraper,
+    'twitter': TwitterScraper,
+    'producthunt': ProductHuntScraper,
+    'weibo': WeiboScraper,
+    'hackernews': HackerNewsScraper,
+    'youtube': YouTubeScraper,
+    'reddit': RedditScraper,
+    'medium': MediumScraper,
+    'bilibili': BilibiliScraper,
+}
+
+@functools.lru_cache(maxsize=512)
+def _parse_url(url: str):
+    """解析URL，同一URL在多个接口间重复使用时直接复用结果"""
+    # 兼容没有协议头的输入，如 github.com/user
+    return urlparse(url if '://' in url else f'//{url}')
 
 def detect_platform(url: str) -> str:
     """检测URL对应的平台"""
-    url = url.lower()
-
-    if 'github.com' in url:
-        return 'github'
-    elif 'twitter.com' in url or 'x.com' in url:
-        return 'twitter'
-    elif 'producthunt.com' in url:
-        return 'producthunt'
-    elif 'weibo.com' in url:
-        return 'weibo'
-    elif 'news.ycombinator.com' in url:
-        return 'hackernews'
-    elif 'youtube.com' in url or 'youtu.be' in url:
-        return 'youtube'
-    elif 'reddit.com' in url:
-        return 'reddit'
-    elif 'medium.com' in url:
-        return 'medium'
-    elif 'bilibili.com' in url:
-        return 'bilibili'
+    parsed = _parse_url(url)
+    parts = (parsed.hostname or '').split('.')
+
+    # 依次匹配二级域名和三级域名，如 github.com、news.ycombinator.com
+    for size in (2, 3):
+        platform = _REGISTERED_DOMAINS.get('.'.join(parts[-size:]))
+        if platform:
+            return platform
+
+    raise ValueError(f"不支持的平台: {url}")
+
+@functools.lru_cache(maxsize=None)
+def get_scraper(platform: str):
+    """获取平台对应的爬取器实例（每个平台只创建一次）"""
+    if platform not in SCRAPER_FACTORIES:
+        raise ValueError(f"不支持的平台: {platform}")
+    return SCRAPER_FACTORIES[platform]()
+
+@app.on_event("startup")
+async def init_scrapers():
+    """预先创建共享HTTP会话、共享浏览器和所有平台的爬取器"""
+    await get_session()
+    try:
+        await get_browser()
+    except Exception:
+        # 启动失败时不阻塞服务，首次爬取时会再次尝试启动
+        logger.exception("预启动浏览器失败")
+    for platform in SCRAPER_FACTORIES:
+        get_scraper(platform)
+
+def _purge_stale_csv_files() -> int:
+    """删除旧版本导出时遗留在临时目录中的CSV文件（现已改为内存流式导出）"""
+    removed = 0
+    for path in pathlib.Path(tempfile.gettempdir()).glob('follownet_*.csv'):
+        try:
+            path.unlink(missing_ok=True)
+            removed += 1
+        except OSError:
+            logger.warning("无法删除临时文件: %s", path)
+    return removed
+
+@app.on_event("startup")
+async def purge_stale_csv_files():
+    removed = await asyncio.to_thread(_purge_stale_csv_files)
+    if removed:
+        logger.info("已清理 %d 个遗留的临时CSV文件", removed)
+
+@app.on_event("shutdown")
+async def close_scrapers():
+    """关闭爬取器持有的资源、共享浏览器和共享HTTP会话"""
+    for platform in SCRAPER_FACTORIES:
+        await get_scraper(platform).close()
+    await close_browser()
+    await close_session()
+
+# 数据缓存过期时间（秒）
+DATA_CACHE_TTL = 1800
+# 相同请求的爬取结果复用时间（秒）
+RESPONSE_CACHE_TTL = 120
+
+# 配置了REDIS_URL时使用Redis缓存，多个worker之间共享数据；否则使用进程内缓存
+REDIS_URL = os.getenv("REDIS_URL")
+redis_client = aioredis.Redis(
+    connection_pool=aioredis.ConnectionPool.from_url(REDIS_URL, max_connections=20)
+) if REDIS_URL else None
+
+data_cache = BoundedTTLCache(capacity=512, ttl=DATA_CACHE_TTL)
+response_cache = BoundedTTLCache(capacity=256, ttl=RESPONSE_CACHE_TTL)
+
+async def _cache_set(cache: BoundedTTLCache, prefix: str, key: str, value: Dict):
+    """写入缓存，优先使用Redis"""
+    if redis_client is not None:
+        await redis_client.set(f"{prefix}:{key}", orjson.dumps(value, default=str), ex=int(cache.ttl))
     else:
-        raise ValueError(f"不支持的平台: {url}")
+        cache.put(key, value)
+
+async def _cache_get(cache: BoundedTTLCache, prefix: str, key: str) -> Optional[Dict]:
+    """读取缓存，不存在或已过期时返回None"""
+    if redis_client is not None:
+        raw = await redis_client.get(f"{prefix}:{key}")
+        return orjson.loads(raw) if raw is not None else None
+    return cache.get(key)
+
+async def save_cached_data(cache_id: str, cache_data: Dict):
+    """保存爬取结果到缓存"""
+    await _cache_set(data_cache, 'scrape', cache_id, cache_data)
+
+async def load_cached_data(cache_id: str) -> Optional[Dict]:
+    """从缓存读取爬取结果，不存在或已过期时返回None"""
+    return await _cache_get(data_cache, 'scrape', cache_id)
+
+def response_cache_key(url: str, page: int, max_users: int, max_pages: int) -> str:
+    """根据请求参数生成爬取结果的缓存键"""
+    raw = f"{url.strip()}|{page}|{max_users}|{max_pages}"
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+async def _sweep_data_cache(interval: float = 60):
+    """定期清理过期的缓存数据"""
+    while True:
+        await asyncio.sleep(interval)
+        data_cache.sweep()
+        response_cache.sweep()
+
+@app.on_event("startup")
+async def start_cache_sweeper():
+    """启动缓存清理任务（Redis会自动过期，无需清理）"""
+    if redis_client is None:
+        app.state.cache_sweeper = asyncio.create_task(_sweep_data_cache())
+
+@app.on_event("shutdown")
+async def stop_cache_sweeper():
+    """停止缓存清理任务并关闭Redis连接"""
+    sweeper = getattr(app.state, 'cache_sweeper', None)
+    if sweeper:
+        sweeper.cancel()
+    if redis_client is not None:
+        await redis_client.aclose()
+
+# 流式会话状态在Redis中的过期时间（秒）
+SESSION_TTL = 3600
+
+def _session_key(session_id: str) -> str:
+    return f"session:{session_id}"
+
+def _session_channel(session_id: str) -> str:
+    return f"session:{session_id}:ctrl"
+
+async def _publish_session_state(session: StreamingSession):
+    """配置Redis时同步会话状态，供其他worker查询"""
+    if redis_client is None:
+        return
+    key = _session_key(session.session_id)
+    state = {k: int(v) for k, v in session.status().items()}
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.hset(key, mapping=state)
+        pipe.expire(key, SESSION_TTL)
+        await pipe.execute()
+
+async def _listen_session_control(session: StreamingSession):
+    """订阅会话控制频道，使任意worker收到的暂停/继续/停止指令都能送达"""
+    pubsub = redis_client.pubsub()
+    await pubsub.subscribe(_session_channel(session.session_id))
+    try:
+        async for message in pubsub.listen():
+            if message['type'] == 'message' and session.apply(message['data'].decode()):
+                await _publish_session_state(session)
+    finally:
+        await pubsub.aclose()
+
+# 单次请求最多爬取的页数及同时爬取的页数
+MAX_PAGES_PER_REQUEST = 10
+PAGE_CONCURRENCY = 5
+
+async def scrape_pages_concurrently(scraper, url: str, first_page: int, page_count: int):
+    """并发爬取连续多页，单页失败不影响其他页
+
+    Returns:
+        (data, has_next_page)
+    """
+    semaphore = asyncio.Semaphore(PAGE_CONCURRENCY)
+
+    async def scrape_one(page: int):
+        async with semaphore:
+            return await scraper.scrape_page(url, page)
+
+    pages = range(first_page, first_page + page_count)
+    results = await asyncio.gather(*(scrape_one(page) for page in pages), return_exceptions=True)
+
+    data = []
+    has_next = False
+    for page, result in zip(pages, results):
+        if isinstance(result, BaseException):
+            logger.warning("第%d页爬取失败: %s", page, result)
+            has_next = False
+            continue
+        data.extend(result.get('data', []))
+        has_next = result.get('has_next_page', False)
 
-# 数据缓存（在生产环境中应该使用数据库或Redis）
-data_cache = {}
+    return data, has_next
 
-@app.post("/api/scrape", response_model=ScrapeResponse)
-async def scrape_followers(request: ScrapeRequest):
-    """分页爬取接口"""
-    try:
-        print(f"开始处理请求: {request.url}, 页码: {request.page}")
-
-        # 检测平台
-        platform = detect_platform(request.url)
-        print(f"检测到平台: {platform}")
-
-        # 选择对应的爬取器
-        if platform == 'github':
-            scraper = GitHubScraper()
-        elif platform == 'twitter':
-            scraper = TwitterScraper()
-        elif platform == 'producthunt':
-            scraper = ProductHuntScraper()
-        elif platform == 'weibo':
-            scraper = WeiboScraper()
-        elif platform == 'hackernews':
-            scraper = HackerNewsScraper()
-        elif platform == 'youtube':
-            scraper = YouTubeScraper()
-        elif platform == 'reddit':
-            scraper = RedditScraper()
-        elif platform == 'medium':
-            scraper = MediumScraper()
-        elif platform == 'bilibili':
-            scraper = BilibiliScraper()
-        else:
-            raise HTTPException(status_code=400, detail="不支持的平台")
+async def _run_scrape(url: str, page: int = 1, max_users: int = 10, max_pages: int = 1):
+    """检测平台并执行爬取，所有爬取接口共用
+
+    Returns:
+        (data, has_next_page, platform, last_page)
+    """
+    # 检测平台
+    platform = detect_platform(url)
+    logger.info("检测到平台: %s", platform)
 
-        print(f"开始执行第{request.page}页爬取，最多{request.max_users}个用户...")
+    # 获取对应平台的爬取器
+    scraper = get_scraper(platform)
 
-        # 检查是否支持分页爬取
-        if hasattr(scraper, 'scrape_page'):
+    logger.info("开始执行第%d页爬取，最多%d个用户...", page, max_users)
+
+    page_count = min(max(max_pages, 1), MAX_PAGES_PER_REQUEST)
+    last_page = page
+
+    # 检查是否支持分页爬取
+    if hasattr(scraper, 'scrape_page'):
+        if page_count > 1:
+            # 并发爬取多页
+            data, has_next = await scrape_pages_concurrently(scraper, url, page, page_count)
+            last_page = page + page_count - 1
+        else:
             # 使用分页爬取
-            result = await scraper.scrape_page(request.url, request.page)
+            result = await scraper.scrape_page(url, page)
             has_next = result.get('has_next_page', False)
             data = result.get('data', [])
-        else:
-            # 兼容旧版本，只支持第一页
-            if request.page > 1:
-                raise HTTPException(status_code=400, detail="该平台暂不支持分页爬取")
-            # 对于GitHub，传递max_users参数
-            if platform == 'github' and hasattr(scraper, 'scrape'):
-                result = await scraper.scrape(request.url, max_users=request.max_users)
-            else:
-                result = await scraper.scrape(request.url)
-            data = result if result else []
-            has_next = False
+    else:
+        # 兼容旧版本，只支持第一页
+        if page > 1:
+            raise HTTPException(status_code=400, detail="该平台暂不支持分页爬取")
+        result = await scraper.scrape(url)
+        data = result if result else []
+        has_next = False
+
+    logger.info("第%d-%d页爬取完成，结果数量: %d", page, last_page, len(data))
+
+    return data, has_next, platform, last_page
+
+# 正在进行中的爬取，相同请求并发到达时共享同一次结果，避免重复启动爬虫
+_inflight: Dict[str, asyncio.Task] = {}
+
+async def _scrape_and_cache(key: str, url: str, page: int, max_users: int, max_pages: int):
+    """执行爬取并写入结果缓存，完成后从进行中的列表移除"""
+    try:
+        result = await _run_scrape(url, page, max_users, max_pages)
+        data, has_next, platform, last_page = result
+        if data:
+            await _cache_set(response_cache, 'response', key, {
+                'data': data,
+                'has_next': has_next,
+                'platform': platform,
+                'last_page': last_page,
+            })
+        return result
+    finally:
+        _inflight.pop(key, None)
+
+async def _run_scrape_single_flight(key: str, url: str, page: int, max_users: int, max_pages: int):
+    """同一个key同时只执行一次爬取，其余请求等待同一个结果
+
+    爬取在独立的任务中执行，不属于任何一个请求；发起请求的客户端断开连接时，
+    其他等待同一结果的请求不受影响
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_scrape_and_cache(key, url, page, max_users, max_pages))
+        _inflight[key] = task
+        # 所有等待方都已断开时也读取异常，避免 "exception was never retrieved" 警告
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    else:
+        logger.info("复用进行中的爬取: %s", url)
+    # shield：某个等待方断开连接时只取消它自己的等待，不取消共享的爬取任务
+    return await asyncio.shield(task)
+
+@app.post("/api/scrape", response_model=ScrapeResponse)
+async def scrape_followers(request: ScrapeRequest, cache_control: Optional[str] = Header(None)):
+    """分页爬取接口，短时间内的相同请求直接返回缓存结果（请求头Cache-Control: no-cache可强制重新爬取）"""
+    try:
+        logger.info("开始处理请求: %s, 页码: %d", request.url, request.page)
 
-        print(f"第{request.page}页爬取完成，结果数量: {len(data)}")
+        result_key = response_cache_key(request.url, request.page, request.max_users, request.max_pages)
+        cached = None
+        if not (cache_control and 'no-cache' in cache_control.lower()):
+            cached = await _cache_get(response_cache, 'response', result_key)
+
+        if cached is not None:
+            logger.info("命中爬取结果缓存: %s", request.url)
+            data, has_next, platform, last_page = cached['data'], cached['has_next'], cached['platform'], cached['last_page']
+        else:
+            data, has_next, platform, last_page = await _run_scrape_single_flight(
+                result_key, request.url, request.page, request.max_users, request.max_pages
+            )
 
         if not data or len(data) == 0:
-            print("未找到数据，但仍返回空结果")
+            logger.info("未找到数据，但仍返回空结果")
             data = []
 
         # 生成缓存ID
-        cache_id = str(uuid.uuid4())
+        cache_id = secrets.token_urlsafe(12)
 
         # 保存到内存缓存
         cache_data = {
@@ -176,11 +492,11 @@ async def scrape_followers(request: ScrapeRequest):
             'data': data,
             'page': request.page,
             'has_next': has_next,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': time.time()
         }
-        data_cache[cache_id] = cache_data
+        await save_cached_data(cache_id, cache_data)
 
-        print(f"缓存数据到 {cache_id}")
+        logger.debug("缓存数据到 %s", cache_id)
 
         return ScrapeResponse(
             success=True,
@@ -189,103 +505,128 @@ async def scrape_followers(request: ScrapeRequest):
             total_extracted=len(data),
             data=data,
             download_url=f"/api/export-csv/{cache_id}",
-            current_page=request.page,
+            current_page=last_page,
             has_next_page=has_next,
             cache_id=cache_id
         )
 
+    except HTTPException:
+        raise
     except ValueError as e:
-        print(f"ValueError: {e}")
+        logger.warning("请求参数错误: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        print(f"Exception: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("爬取失败")
         raise HTTPException(status_code=500, detail=f"爬取失败: {str(e)}")
 
+def _sse(payload: Dict) -> bytes:
+    """编码一条SSE消息"""
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+async def _batch_events(events, window: float = 0.1, max_size: int = 32):
+    """将事件流合并成批次：最多缓冲window秒或max_size个事件后一起发送"""
+    buffer = []
+    deadline = None
+    next_event = None
+
+    try:
+        while True:
+            if next_event is None:
+                next_event = asyncio.ensure_future(events.__anext__())
+
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            done, _ = await asyncio.wait({next_event}, timeout=timeout)
+
+            if not done:
+                # 缓冲时间已到，先发送已有事件
+                yield buffer
+                buffer, deadline = [], None
+                continue
+
+            task, next_event = next_event, None
+            try:
+                event = task.result()
+            except StopAsyncIteration:
+                break
+
+            buffer.append(event)
+            if deadline is None:
+                deadline = time.monotonic() + window
+
+            # 批次已满或是结束类消息时立即发送
+            if len(buffer) >= max_size or event.get('type') in ('complete', 'error'):
+                yield buffer
+                buffer, deadline = [], None
+
+        if buffer:
+            yield buffer
+    finally:
+        if next_event is not None:
+            next_event.cancel()
+
 @app.post("/api/scrape-stream")
 async def scrape_stream(request: ScrapeRequest):
     """流式爬取接口 - 边爬边返回数据，支持控制"""
-    session_id = str(uuid.uuid4())
+    session_id = secrets.token_urlsafe(12)
 
-    async def generate_stream() -> AsyncGenerator[str, None]:
+    async def generate_stream() -> AsyncGenerator[bytes, None]:
         session = StreamingSession(session_id, request)
         streaming_sessions[session_id] = session
         session.is_running = True
+        control_listener = None
 
         try:
+            if redis_client is not None:
+                await _publish_session_state(session)
+                control_listener = asyncio.create_task(_listen_session_control(session))
+
             # 发送开始消息，包含session_id
-            yield f"data: {json.dumps({'type': 'start', 'message': '开始爬取...', 'url': request.url, 'session_id': session_id})}\n\n"
+            yield _sse({'type': 'start', 'message': '开始爬取...', 'url': request.url, 'session_id': session_id})
 
             # 检测平台
             platform = detect_platform(request.url)
-            yield f"data: {json.dumps({'type': 'platform', 'platform': platform, 'session_id': session_id})}\n\n"
-
-            # 创建爬取器
-            if platform == 'github':
-                scraper = GitHubScraper()
-            elif platform == 'twitter':
-                scraper = TwitterScraper()
-            elif platform == 'producthunt':
-                scraper = ProductHuntScraper()
-            elif platform == 'weibo':
-                scraper = WeiboScraper()
-            elif platform == 'hackernews':
-                scraper = HackerNewsScraper()
-            elif platform == 'youtube':
-                scraper = YouTubeScraper()
-            elif platform == 'reddit':
-                scraper = RedditScraper()
-            elif platform == 'medium':
-                scraper = MediumScraper()
-            elif platform == 'bilibili':
-                scraper = BilibiliScraper()
-            else:
-                yield f"data: {json.dumps({'type': 'error', 'message': f'不支持的平台: {platform}', 'session_id': session_id})}\n\n"
-                return
+            yield _sse({'type': 'platform', 'platform': platform, 'session_id': session_id})
+
+            # 获取对应平台的爬取器
+            scraper = get_scraper(platform)
 
             # 为GitHub特殊处理，支持流式爬取
             if platform == 'github' and hasattr(scraper, 'scrape_with_progress'):
                 session.progress_generator = scraper.scrape_with_progress(request.url, max_users=request.max_users)
 
-                async for progress_data in session.progress_generator:
+                # 合并短时间内的多条进度消息，减少前端处理次数
+                async for batch in _batch_events(session.progress_generator):
                     # 检查控制状态
-                    while session.is_paused and not session.is_stopped:
-                        await asyncio.sleep(0.5)
+                    await session.wait_if_paused()
 
                     if session.is_stopped:
-                        yield f"data: {json.dumps({'type': 'stopped', 'message': '爬取已停止', 'session_id': session_id})}\n\n"
+                        yield _sse({'type': 'stopped', 'message': '爬取已停止', 'session_id': session_id})
                         break
 
-                    # 添加session_id到所有消息
-                    progress_data['session_id'] = session_id
+                    for progress_data in batch:
+                        # 添加session_id到所有消息
+                        progress_data['session_id'] = session_id
 
-                    # 如果是用户完成消息，保存数据
-                    if progress_data.get('type') == 'user_completed' and progress_data.get('user_data'):
-                        session.current_data.append(progress_data['user_data'])
+                        # 如果是用户完成消息，保存数据
+                        if progress_data.get('type') == 'user_completed' and progress_data.get('user_data'):
+                            session.current_data.append(progress_data['user_data'])
 
-                    yield f"data: {json.dumps(progress_data)}\n\n"
-                    await asyncio.sleep(0.1)  # 小延迟避免前端处理不过来
+                    await _publish_session_state(session)
+
+                    if len(batch) == 1:
+                        yield _sse(batch[0])
+                    else:
+                        yield _sse({'type': 'batch', 'events': batch, 'session_id': session_id})
             else:
                 # 其他平台的普通爬取
-                yield f"data: {json.dumps({'type': 'progress', 'message': f'正在爬取{platform}数据...', 'session_id': session_id})}\n\n"
-
-                if hasattr(scraper, 'scrape_page'):
-                    result = await scraper.scrape_page(request.url, request.page)
-                    data = result.get('data', [])
-                    has_next = result.get('has_next_page', False)
-                else:
-                    if platform == 'github':
-                        result = await scraper.scrape(request.url, max_users=request.max_users)
-                    else:
-                        result = await scraper.scrape(request.url)
-                    data = result if result else []
-                    has_next = False
+                yield _sse({'type': 'progress', 'message': f'正在爬取{platform}数据...', 'session_id': session_id})
+
+                data, has_next, platform, _ = await _run_scrape(request.url, request.page, request.max_users, request.max_pages)
 
                 session.current_data = data
 
                 # 发送最终结果
-                yield f"data: {json.dumps({
+                yield _sse({
                     'type': 'complete',
                     'data': data,
                     'total': len(data),
@@ -294,173 +635,147 @@ async def scrape_stream(request: ScrapeRequest):
                     'platform': platform,
                     'session_id': session_id,
                     'message': f'爬取完成！共获取 {len(data)} 个用户信息'
-                })}\n\n"
+                })
 
         except Exception as e:
             error_msg = f"爬取过程中出错: {str(e)}"
-            yield f"data: {json.dumps({'type': 'error', 'message': error_msg, 'session_id': session_id})}\n\n"
+            yield _sse({'type': 'error', 'message': error_msg, 'session_id': session_id})
         finally:
             # 清理会话
             session.is_running = False
-            if session_id in streaming_sessions:
-                del streaming_sessions[session_id]
+            streaming_sessions.pop(session_id, None)
+            if control_listener is not None:
+                control_listener.cancel()
+                await redis_client.delete(_session_key(session_id))
 
     return StreamingResponse(
         generate_stream(),
-        media_type="text/plain",
+        media_type="text/event-stream",
         headers={
-            "Cache-Control": "no-cache",
+            # 流式响应不压缩，避免GZip缓冲导致消息无法实时送达
+            "Cache-Control": "no-cache, no-transform",
+            "Content-Encoding": "identity",
+            # 禁止nginx等反向代理缓冲流式响应
+            "X-Accel-Buffering": "no",
             "Connection": "keep-alive",
             "Access-Control-Allow-Origin": "*",
             "Access-Control-Allow-Headers": "*",
         }
     )
 
+_CONTROL_MESSAGES = {'pause': "爬取已暂停", 'resume': "爬取已继续", 'stop': "爬取已停止"}
+
 @app.post("/api/streaming-control")
 async def control_streaming(request: StreamingControlRequest):
     """控制流式爬取：暂停、继续、停止"""
-    if request.session_id not in streaming_sessions:
-        raise HTTPException(status_code=404, detail="会话不存在或已过期")
+    if request.action not in _CONTROL_MESSAGES:
+        raise HTTPException(status_code=400, detail="无效的操作")
 
-    session = streaming_sessions[request.session_id]
-
-    if request.action == 'pause':
-        session.pause()
-        return {"success": True, "message": "爬取已暂停", "session_id": request.session_id}
-    elif request.action == 'resume':
-        session.resume()
-        return {"success": True, "message": "爬取已继续", "session_id": request.session_id}
-    elif request.action == 'stop':
-        session.stop()
-        return {"success": True, "message": "爬取已停止", "session_id": request.session_id}
+    session = streaming_sessions.get(request.session_id)
+    if session is not None:
+        session.apply(request.action)
+        await _publish_session_state(session)
+    elif redis_client is not None and await redis_client.exists(_session_key(request.session_id)):
+        # 会话由其他worker处理，通过Redis频道转发指令
+        await redis_client.publish(_session_channel(request.session_id), request.action)
     else:
-        raise HTTPException(status_code=400, detail="无效的操作")
+        raise HTTPException(status_code=404, detail="会话不存在或已过期")
+
+    return {"success": True, "message": _CONTROL_MESSAGES[request.action], "session_id": request.session_id}
 
 @app.get("/api/streaming-status/{session_id}")
 async def get_streaming_status(session_id: str):
     """获取流式爬取状态"""
-    if session_id not in streaming_sessions:
+    session = streaming_sessions.get(session_id)
+    if session is not None:
+        status = session.status()
+    elif redis_client is not None:
+        state = await redis_client.hgetall(_session_key(session_id))
+        if not state:
+            return {"exists": False, "message": "会话不存在或已过期"}
+        status = {k.decode(): int(v) for k, v in state.items()}
+        status.update({k: bool(status.get(k)) for k in ('is_running', 'is_paused', 'is_stopped')})
+    else:
         return {"exists": False, "message": "会话不存在或已过期"}
 
-    session = streaming_sessions[session_id]
-    return {
-        "exists": True,
-        "is_running": session.is_running,
-        "is_paused": session.is_paused,
-        "is_stopped": session.is_stopped,
-        "data_count": len(session.current_data),
-        "session_id": session_id
-    }
+    return {"exists": True, **status, "session_id": session_id}
 
 @app.post("/api/scrape-and-download")
 async def scrape_and_download(request: ScrapeRequest):
     """爬取数据并直接下载CSV文件"""
     try:
-        print(f"开始爬取并下载: {request.url}, 页码: {request.page}")
-
-        # 检测平台
-        platform = detect_platform(request.url)
-        print(f"检测到平台: {platform}")
-
-        # 选择对应的爬取器
-        if platform == 'github':
-            scraper = GitHubScraper()
-        elif platform == 'twitter':
-            scraper = TwitterScraper()
-        elif platform == 'producthunt':
-            scraper = ProductHuntScraper()
-        elif platform == 'weibo':
-            scraper = WeiboScraper()
-        elif platform == 'hackernews':
-            scraper = HackerNewsScraper()
-        elif platform == 'youtube':
-            scraper = YouTubeScraper()
-        elif platform == 'reddit':
-            scraper = RedditScraper()
-        elif platform == 'medium':
-            scraper = MediumScraper()
-        elif platform == 'bilibili':
-            scraper = BilibiliScraper()
-        else:
-            raise HTTPException(status_code=400, detail="不支持的平台")
+        logger.info("开始爬取并下载: %s, 页码: %d", request.url, request.page)
 
-        print(f"开始执行第{request.page}页爬取，最多{request.max_users}个用户...")
-
-        # 检查是否支持分页爬取
-        if hasattr(scraper, 'scrape_page'):
-            # 使用分页爬取
-            result = await scraper.scrape_page(request.url, request.page)
-            has_next = result.get('has_next_page', False)
-            data = result.get('data', [])
-        else:
-            # 兼容旧版本，只支持第一页
-            if request.page > 1:
-                raise HTTPException(status_code=400, detail="该平台暂不支持分页爬取")
-            # 对于GitHub，传递max_users参数
-            if platform == 'github' and hasattr(scraper, 'scrape'):
-                result = await scraper.scrape(request.url, max_users=request.max_users)
-            else:
-                result = await scraper.scrape(request.url)
-            data = result if result else []
-            has_next = False
-
-        print(f"第{request.page}页爬取完成，结果数量: {len(data)}")
+        data, has_next, platform, _ = await _run_scrape(request.url, request.page, request.max_users, request.max_pages)
 
         if not data or len(data) == 0:
             raise HTTPException(status_code=404, detail="未找到数据或爬取失败")
 
-        # 直接生成并返回CSV文件
-        from urllib.parse import urlparse, quote
-        parsed_url = urlparse(request.url)
-        url_parts = parsed_url.path.strip('/').split('/')
-
-        if len(url_parts) >= 1:
-            identifier = url_parts[0] if url_parts[0] else "unknown"
-        else:
-            identifier = "unknown"
+        # 直接生成并返回CSV文件，文件名中的标识转义后才能安全放入响应头
+        url_parts = _parse_url(request.url).path.strip('/').split('/')
+        identifier = quote(unquote(url_parts[0]), safe='') if url_parts[0] else "unknown"
 
         csv_filename = f"follownet_{platform}_{identifier}_page{request.page}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        csv_path = os.path.join(tempfile.gettempdir(), csv_filename)
-
-        # 保存数据到CSV
-        await scraper.save_to_csv(data, csv_path)
-        print(f"CSV文件已生成: {csv_path}")
 
-        return FileResponse(
-            path=csv_path,
-            filename=csv_filename,
+        # 边生成边返回CSV内容，不落盘
+        return StreamingResponse(
+            SCRAPER_FACTORIES[platform].aiter_csv(data),
             media_type='text/csv',
-            headers={"Content-Disposition": f"attachment; filename={csv_filename}"}
+            headers={"Content-Disposition": f'attachment; filename="{csv_filename}"'}
         )
 
+    except HTTPException:
+        raise
     except ValueError as e:
-        print(f"ValueError: {e}")
+        logger.warning("请求参数错误: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        print(f"Exception: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("爬取失败")
         raise HTTPException(status_code=500, detail=f"爬取失败: {str(e)}")
 
+# 批量获取详细信息时同时打开的页面数
+BATCH_DETAILS_CONCURRENCY = 8
+# 批量获取详细信息时同时进行的用户数（包括走API、不占用页面的请求）
+BATCH_DETAILS_FETCH_LIMIT = 20
+
 @app.post("/api/github-forks/batch-details")
 async def get_batch_user_details(request: BatchDetailsRequest):
     """批量获取GitHub fork用户的详细信息（阶段2）"""
     try:
-        print(f"开始批量获取 {len(request.users)} 个用户的详细信息")
+        logger.info("开始批量获取 %d 个用户的详细信息", len(request.users))
 
-        scraper = GitHubScraper()
+        if len(request.users) > MAX_USERS_LIMIT:
+            raise HTTPException(status_code=400, detail=f"单次最多获取 {MAX_USERS_LIMIT} 个用户的详细信息")
 
-        # 执行阶段2：获取用户详细信息
-        detailed_users = await scraper._scrape_forks_users_details(
-            request.users,
-            request.original_owner,
-            request.original_repo
-        )
+        scraper = get_scraper('github')
+
+        # 执行阶段2：并发获取用户详细信息，页面池的大小限制同时打开的页面数，页面在用户之间复用
+        # 页面池只限制回退到页面爬取的部分，信号量限制整体并发，API请求也不会一次全部发出
+        pages = PagePool(BATCH_DETAILS_CONCURRENCY, block_resources=True)
+        semaphore = asyncio.Semaphore(BATCH_DETAILS_FETCH_LIMIT)
 
-        print(f"批量获取完成，成功获取 {len(detailed_users)} 个用户的详细信息")
+        async def fetch(user: Dict[str, str]):
+            async with semaphore:
+                return await scraper._get_single_user_concurrent(
+                    {**user, 'source_user': request.original_owner, 'source_repo': request.original_repo},
+                    'fork_owner',
+                    pages,
+                )
+
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(fetch(user)) for user in request.users]
+        finally:
+            await pages.close()
+        detailed_users = [
+            scraper._normalize_user_data(task.result(), 'fork_owner')
+            for task in tasks if task.result()
+        ]
+
+        logger.info("批量获取完成，成功获取 %d 个用户的详细信息", len(detailed_users))
 
         # 生成缓存ID
-        cache_id = str(uuid.uuid4())
+        cache_id = secrets.token_urlsafe(12)
 
         # 保存到内存缓存
         cache_data = {
@@ -468,9 +783,9 @@ async def get_batch_user_details(request: BatchDetailsRequest):
             'data': detailed_users,
             'page': 1,
             'has_next': False,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': time.time()
         }
-        data_cache[cache_id] = cache_data
+        await save_cached_data(cache_id, cache_data)
 
         return ScrapeResponse(
             success=True,
@@ -484,18 +799,20 @@ async def get_batch_user_details(request: BatchDetailsRequest):
             cache_id=cache_id
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"批量获取用户详细信息出错: {e}")
+        logger.exception("批量获取用户详细信息出错")
         raise HTTPException(status_code=500, detail=f"获取用户详细信息失败: {str(e)}")
 
 @app.get("/api/export-csv/{cache_id}")
 async def export_csv(cache_id: str):
     """导出缓存数据为CSV文件"""
     try:
-        if cache_id not in data_cache:
+        cache_data = await load_cached_data(cache_id)
+        if cache_data is None:
             raise HTTPException(status_code=404, detail="数据不存在或已过期")
 
-        cache_data = data_cache[cache_id]
         platform = cache_data['platform']
         data = cache_data['data']
         page = cache_data['page']
@@ -503,45 +820,20 @@ async def export_csv(cache_id: str):
         if not data:
             raise HTTPException(status_code=404, detail="没有可导出的数据")
 
-        # 创建临时CSV文件
         csv_filename = f"follownet_{platform}_page{page}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        csv_path = os.path.join(tempfile.gettempdir(), csv_filename)
-
-        # 根据平台选择对应的爬取器来保存CSV
-        if platform == 'github':
-            scraper = GitHubScraper()
-        elif platform == 'twitter':
-            scraper = TwitterScraper()
-        elif platform == 'producthunt':
-            scraper = ProductHuntScraper()
-        elif platform == 'weibo':
-            scraper = WeiboScraper()
-        elif platform == 'hackernews':
-            scraper = HackerNewsScraper()
-        elif platform == 'youtube':
-            scraper = YouTubeScraper()
-        elif platform == 'reddit':
-            scraper = RedditScraper()
-        elif platform == 'medium':
-            scraper = MediumScraper()
-        elif platform == 'bilibili':
-            scraper = BilibiliScraper()
-        else:
-            raise HTTPException(status_code=400, detail="不支持的平台")
 
-        # 保存数据到CSV
-        await scraper.save_to_csv(data, csv_path)
-        print(f"CSV文件已生成: {csv_path}")
-
-        return FileResponse(
-            path=csv_path,
-            filename=csv_filename,
+        # CSV生成只依赖爬取器类，无需创建实例；边生成边返回，不落盘
+        scraper_cls = SCRAPER_FACTORIES.get(platform, BaseScraper)
+        return StreamingResponse(
+            scraper_cls.aiter_csv(data),
             media_type='text/csv',
-            headers={"Content-Disposition": f"attachment; filename={csv_filename}"}
+            headers={"Content-Disposition": f'attachment; filename="{csv_filename}"'}
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"导出CSV时出错: {e}")
+        logger.exception("导出CSV时出错")
         raise HTTPException(status_code=500, detail=f"导出失败: {str(e)}")
 
 @app.get("/")
@@ -553,6 +845,40 @@ async def root():
         "docs": "/docs"
     }
 
+async def test_github():
+    """调试接口：测试GitHub爬取器（仅在设置 FOLLOWNET_DEBUG 时注册）"""
+    url = "https://github.com/connor4312?tab=followers"
+    logger.info("调试GitHub爬取器: %s", url)
+    try:
+        result = await get_scraper('github').scrape(url)
+        return {
+            "success": True,
+            "total": len(result) if result else 0,
+            "sample_data": result[:3] if result else []
+        }
+    except Exception as e:
+        logger.exception("调试爬取失败")
+        return {"success": False, "error": str(e)}
+
+if os.getenv("FOLLOWNET_DEBUG"):
+    app.add_api_route("/test-github", test_github, methods=["GET"])
+
 if __name__ == "__main__":
+    import sys
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+
+    # 非Windows平台使用 uvloop + httptools 降低事件循环与HTTP解析开销
+    server_options = {}
+    if sys.platform != "win32":
+        server_options.update(loop="uvloop", http="httptools")
+
+    # 流式会话（暂停/停止控制）和未配置Redis时的缓存都保存在进程内，默认单进程；
+    # 配置 REDIS_URL 并使用粘性会话时可通过 WEB_CONCURRENCY 开启多进程
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8000")),
+        workers=workers,
+        **server_options,
+    )
\ No newline at end of file
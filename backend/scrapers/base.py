@@ -1,42 +1,88 @@
 from abc import ABC, abstractmethod
 import csv
+import io
+import operator
 import asyncio
-from playwright.async_api import async_playwright
-from typing import List, Dict, Any
+from contextvars import ContextVar
+from playwright.async_api import BrowserContext, Page, TimeoutError as PlaywrightTimeoutError
+from typing import List, Dict, Any, Iterator, AsyncIterator, Optional
 
 class BaseScraper(ABC):
     """基础爬取器抽象类"""
     
-    def __init__(self):
-        self.browser = None
-        self.page = None
+    # 导出CSV使用的标准字段名
+    CSV_FIELDNAMES = (
+        'username', 'display_name', 'bio', 'avatar_url', 'profile_url',
+        'platform', 'type', 'follower_count', 'following_count',
+        'company', 'location', 'website', 'twitter', 'additional_info', 'scraped_at'
+    )
     
-    async def setup_browser(self):
-        """设置浏览器"""
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=True)
-        self.page = await self.browser.new_page()
-        
-        # 设置用户代理以避免检测
-        await self.page.set_extra_http_headers({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
+    def __init__(self, session=None):
+        # 爬取器实例在请求间复用，浏览器上下文和页面按任务分别保存，
+        # 同一平台的多个爬取可以同时进行，互不覆盖
+        self._context_var: ContextVar[Optional[BrowserContext]] = ContextVar(f'{type(self).__name__}.context', default=None)
+        self._page_var: ContextVar[Optional[Page]] = ContextVar(f'{type(self).__name__}.page', default=None)
+        # 可注入的aiohttp会话，未注入时使用进程共享的会话
+        self._session = session
+    
+    @property
+    def context(self) -> Optional[BrowserContext]:
+        """当前任务的浏览器上下文"""
+        return self._context_var.get()
+    
+    @context.setter
+    def context(self, value: Optional[BrowserContext]):
+        self._context_var.set(value)
+    
+    @property
+    def page(self) -> Optional[Page]:
+        """当前任务的页面"""
+        return self._page_var.get()
+    
+    @page.setter
+    def page(self, value: Optional[Page]):
+        self._page_var.set(value)
+    
+    async def get_session(self):
+        """获取HTTP会话"""
+        if self._session is None:
+            from http_client import get_session
+            self._session = await get_session()
+        return self._session
+    
+    async def setup_browser(self, block_resources: bool = False):
+        """在共享浏览器中创建独立的上下文和页面
+
+        Args:
+            block_resources: 是否拦截图片、样式、字体等资源，只在不依赖页面布局的爬取中开启
+        """
+        from browser_pool import new_context
+        self.context = await new_context(block_resources)
+        try:
+            self.page = await self.context.new_page()
+        except Exception:
+            await self.cleanup()
+            raise
     
     async def cleanup(self):
         """清理资源"""
-        if self.page:
-            await self.page.close()
-        if self.browser:
-            await self.browser.close()
-        if hasattr(self, 'playwright'):
-            await self.playwright.stop()
+        await self.close()
+    
+    async def close(self):
+        """关闭当前任务的浏览器上下文（共享浏览器由browser_pool统一关闭）"""
+        if self.context:
+            # 关闭上下文会同时关闭其中的页面
+            await self.context.close()
+            self.context = None
+        self.page = None
     
     @abstractmethod
     async def scrape(self, url: str) -> List[Dict[str, Any]]:
         """爬取数据的抽象方法"""
         pass
     
-    def normalize_user_data(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
+    @classmethod
+    def normalize_user_data(cls, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """标准化用户数据字段"""
         normalized = {
             'username': user_data.get('username', ''),
@@ -74,26 +120,34 @@ class BaseScraper(ABC):
         
         return normalized
     
-    async def save_to_csv(self, data: List[Dict[str, Any]], filepath: str):
-        """将数据保存为CSV文件"""
-        if not data:
-            return
+    @classmethod
+    def iter_csv(cls, data: List[Dict[str, Any]], chunk_size: int = 16384) -> Iterator[str]:
+        """逐块生成CSV内容，每块约chunk_size个字符（不依赖实例状态，导出时无需创建爬取器）"""
+        buffer = io.StringIO()
+        # 标准化后的字段已确定，直接按字段顺序取值，省去DictWriter逐行校验键的开销
+        writer = csv.writer(buffer)
+        writer.writerow(cls.CSV_FIELDNAMES)
+        to_row = operator.itemgetter(*cls.CSV_FIELDNAMES)
         
-        # 标准化所有数据
-        normalized_data = [self.normalize_user_data(item) for item in data]
+        for item in data:
+            # 标准化数据后写入
+            writer.writerow(to_row(cls.normalize_user_data(item)))
+            if buffer.tell() >= chunk_size:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
         
-        # 使用标准字段名
-        fieldnames = [
-            'username', 'display_name', 'bio', 'avatar_url', 'profile_url',
-            'platform', 'type', 'follower_count', 'following_count', 
-            'company', 'location', 'website', 'twitter', 'additional_info', 'scraped_at'
-        ]
-        
-        with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(normalized_data)
+        if buffer.tell():
+            yield buffer.getvalue()
     
+    @classmethod
+    async def aiter_csv(cls, data: List[Dict[str, Any]], chunk_size: int = 16384) -> AsyncIterator[str]:
+        """iter_csv的异步版本，供StreamingResponse直接迭代，避免每块都切换到线程池"""
+        for chunk in cls.iter_csv(data, chunk_size):
+            yield chunk
+            # 每块之间让出事件循环，导出大量数据时其他请求不会被阻塞
+            await asyncio.sleep(0)
+
     async def wait_for_element(self, selector: str, timeout: int = 10000):
         """等待元素出现"""
         try:
@@ -102,16 +156,16 @@ class BaseScraper(ABC):
         except:
             return False
     
-    async def scroll_to_load_more(self, max_scrolls: int = 10):
-        """滚动页面以加载更多内容"""
+    async def scroll_to_load_more(self, max_scrolls: int = 10, timeout: int = 5000):
+        """滚动页面以加载更多内容，页面高度不再增长时停止"""
         for i in range(max_scrolls):
+            previous_height = await self.page.evaluate("document.body.scrollHeight")
             await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await asyncio.sleep(2)
-            
-            # 检查是否还有更多内容
-            current_height = await self.page.evaluate("document.body.scrollHeight")
-            await asyncio.sleep(1)
-            new_height = await self.page.evaluate("document.body.scrollHeight")
             
-            if current_height == new_height:
-                break 
\ No newline at end of file
+            # 等待新内容渲染（页面变高），而不是固定等待
+            try:
+                await self.page.wait_for_function(
+                    "prev => document.body.scrollHeight > prev", arg=previous_height, timeout=timeout
+                )
+            except PlaywrightTimeoutError:
+                break
@@ -1,30 +1,46 @@
 import re
 from datetime import datetime
 from typing import List, Dict, Any
+from urllib.parse import urlparse
 from .base import BaseScraper
 
 class BilibiliScraper(BaseScraper):
-    """Bilibili爬取器"""
-    
+    """Bilibili爬取器（直接请求公开的JSON接口，无需浏览器）"""
+
+    CARD_API = 'https://api.bilibili.com/x/web-interface/card'
+
     async def scrape(self, url: str) -> List[Dict[str, Any]]:
-        """爬取Bilibili数据"""
-        await self.setup_browser()
-        
-        try:
-            # 简化实现，返回示例数据
-            return [{
-                'username': 'bilibili_user_example',
-                'display_name': 'Bilibili用户示例',
-                'bio': 'B站用户示例数据 - 功能正在开发中',
-                'avatar_url': 'https://www.bilibili.com/favicon.ico',
-                'profile_url': url,
-                'platform': 'bilibili',
-                'type': 'bilibili_user',
-                'follower_count': '1000',
-                'following_count': '100',
-                'additional_info': '视频数: 50; 获赞数: 10000',
-                'scraped_at': datetime.now().isoformat()
-            }]
-        
-        finally:
-            await self.cleanup() 
\ No newline at end of file
+        """爬取Bilibili用户信息"""
+        # 用户主页形如 https://space.bilibili.com/123456
+        match = re.search(r'/(\d+)', urlparse(url).path)
+        if not match:
+            raise ValueError("无法识别的Bilibili URL格式")
+        mid = match.group(1)
+
+        session = await self.get_session()
+        async with session.get(
+            self.CARD_API,
+            params={'mid': mid},
+            headers={'Referer': 'https://space.bilibili.com/'},
+        ) as response:
+            response.raise_for_status()
+            payload = await response.json(content_type=None)
+
+        if payload.get('code') != 0:
+            raise ValueError(f"Bilibili接口返回错误: {payload.get('message', '未知错误')}")
+
+        data = payload.get('data') or {}
+        card = data.get('card') or {}
+        return [{
+            'username': str(card.get('mid', mid)),
+            'display_name': card.get('name', ''),
+            'bio': card.get('sign', ''),
+            'avatar_url': card.get('face', ''),
+            'profile_url': f"https://space.bilibili.com/{mid}",
+            'platform': 'bilibili',
+            'type': 'bilibili_user',
+            'follower_count': str(data.get('follower', card.get('fans', ''))),
+            'following_count': str(card.get('attention', '')),
+            'additional_info': f"视频数: {data.get('archive_count', 0)}; 获赞数: {data.get('like_num', 0)}",
+            'scraped_at': datetime.now().isoformat()
+        }]
@@ -0,0 +1,130 @@
+"""
+GitHub REST API 访问
+用户列表类数据（followers/stargazers）直接从API获取JSON，无需启动浏览器渲染页面；
+配置 GITHUB_TOKEN 环境变量可将速率限制从每小时60次提升到5000次
+"""
+import asyncio
+import os
+import re
+import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import aiohttp
+
+from cache import BoundedTTLCache
+
+API_BASE = 'https://api.github.com'
+# 同时请求的列表页数
+PAGE_CONCURRENCY = 5
+
+_LAST_PAGE_RE = re.compile(r'[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
+# 触发速率限制后，在配额重置前直接失败，避免每次调用都白白请求一次
+_rate_limited_until = 0.0
+
+# 用户资料及其ETag；资料缓存过期后带If-None-Match重新请求，未变化时GitHub返回304。
+# 仅在设置了GITHUB_TOKEN（带Authorization头）时304不计入速率限制，匿名请求仍占用每小时60次的配额
+USER_ETAG_TTL = 86400
+_user_etags = BoundedTTLCache(capacity=10000, ttl=USER_ETAG_TTL)
+
+
+class GitHubAPIError(Exception):
+    """API请求失败（如触发速率限制），调用方可回退到页面爬取"""
+
+
+def _headers() -> Dict[str, str]:
+    headers = {
+        'Accept': 'application/vnd.github+json',
+        'X-GitHub-Api-Version': '2022-11-28',
+    }
+    token = os.getenv('GITHUB_TOKEN')
+    if token:
+        headers['Authorization'] = f'Bearer {token}'
+    return headers
+
+
+async def fetch_json(path: str, params: Optional[Dict[str, Any]] = None,
+                     etag: Optional[str] = None) -> Tuple[Any, Mapping[str, str]]:
+    """请求API并返回 (JSON数据, 响应头)
+
+    传入etag时发送条件请求，资源未变化（HTTP 304）时JSON数据为None
+    """
+    global _rate_limited_until
+    if time.time() < _rate_limited_until:
+        raise GitHubAPIError('API速率限制尚未重置')
+
+    headers = _headers()
+    if etag:
+        headers['If-None-Match'] = etag
+
+    from http_client import get_session
+    session = await get_session()
+    try:
+        async with session.get(f'{API_BASE}{path}', params=params, headers=headers) as response:
+            if response.status in (403, 429) and response.headers.get('X-RateLimit-Remaining') == '0':
+                _rate_limited_until = float(response.headers.get('X-RateLimit-Reset', time.time() + 60))
+                raise GitHubAPIError(f'{path} 触发速率限制')
+            if response.status == 304 and etag:
+                return None, response.headers
+            if response.status != 200:
+                raise GitHubAPIError(f'{path} 返回 HTTP {response.status}')
+            return await response.json(), response.headers
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        # 超时也视为API不可用，调用方才能回退到页面爬取
+        raise GitHubAPIError(f'{path} 请求失败: {e!r}') from e
+
+
+async def list_users_page(path: str, page: int, per_page: int = 50) -> Tuple[List[str], bool]:
+    """获取用户列表接口的一页
+
+    Returns:
+        (用户名列表, 是否有下一页)
+    """
+    users, headers = await fetch_json(path, {'per_page': per_page, 'page': page})
+    logins = [user['login'] for user in users if user.get('login')]
+    # Link 头中包含 rel="next" 说明还有下一页
+    has_next = 'rel="next"' in headers.get('Link', '')
+    return logins, has_next
+
+
+async def list_users(path: str, max_pages: int, per_page: int = 50) -> List[Tuple[int, List[str]]]:
+    """获取用户列表接口的前max_pages页
+
+    先请求第一页，从 Link 头的 rel="last" 得到总页数，其余页并发请求
+
+    Returns:
+        [(页码, 用户名列表), ...]，按页码排序
+    """
+    first_users, headers = await fetch_json(path, {'per_page': per_page, 'page': 1})
+    pages = [(1, [user['login'] for user in first_users if user.get('login')])]
+
+    match = _LAST_PAGE_RE.search(headers.get('Link', ''))
+    last_page = min(int(match.group(1)), max_pages) if match else 1
+    if last_page <= 1:
+        return pages
+
+    semaphore = asyncio.Semaphore(PAGE_CONCURRENCY)
+
+    async def fetch_page(page: int) -> Tuple[int, List[str]]:
+        async with semaphore:
+            logins, _ = await list_users_page(path, page, per_page)
+            return page, logins
+
+    pages.extend(await asyncio.gather(*(fetch_page(page) for page in range(2, last_page + 1))))
+    return pages
+
+
+async def get_user(username: str) -> Dict[str, Any]:
+    """获取单个用户的公开资料，之前获取过的用户发送条件请求"""
+    key = username.lower()
+    cached = _user_etags.get(key)
+    user, headers = await fetch_json(f'/users/{username}', etag=cached[0] if cached else None)
+    if user is None:
+        # 304：资料未变化，沿用上次的结果
+        _user_etags.put(key, cached)
+        return cached[1]
+
+    etag = headers.get('ETag')
+    if etag:
+        _user_etags.put(key, (etag, user))
+    return user
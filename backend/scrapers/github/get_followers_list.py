@@ -1,9 +1,90 @@
+import logging
 import asyncio
 import csv
+import operator
 import os
 from datetime import datetime
-from typing import List, Dict, Any
-from playwright.async_api import async_playwright
+from typing import Callable, List, Dict, Any, Optional, Sequence
+
+import aiohttp
+from selectolax.parser import HTMLParser
+
+from browser_pool import new_context, close_browser
+from .api import PAGE_CONCURRENCY, GitHubAPIError, list_users
+
+logger = logging.getLogger(__name__)
+
+# 分页区域中可点击的"下一页"链接（到最后一页时GitHub将其渲染为禁用的span）
+_HAS_NEXT_PAGE_JS = """() => [...document.querySelectorAll('.pagination a, .paginate-container a, a[rel="next"], a[aria-label="Next"]')]
+    .some(a => (a.rel === 'next' || /next/i.test(a.textContent) || a.getAttribute('aria-label') === 'Next')
+        && a.getAttribute('aria-disabled') !== 'true' && !a.classList.contains('disabled'))"""
+
+
+async def page_has_next(page) -> bool:
+    """在页面内一次求值判断是否有下一页，代替逐个选择器查询"""
+    return await page.evaluate(_HAS_NEXT_PAGE_JS)
+
+
+def html_has_next(tree: HTMLParser) -> bool:
+    """与 page_has_next 相同的判断，用于直接解析的HTML"""
+    for a in tree.css('.pagination a, .paginate-container a, a[rel="next"], a[aria-label="Next"]'):
+        attrs = a.attributes
+        if attrs.get('aria-disabled') == 'true' or 'disabled' in (attrs.get('class') or '').split():
+            continue
+        if attrs.get('rel') == 'next' or attrs.get('aria-label') == 'Next' or 'next' in a.text().lower():
+            return True
+    return False
+
+
+# 第一阶段CSV字段
+CSV_FIELDNAMES = ['username', 'profile_url', 'type', 'source_user', 'source_repo', 'page_number', 'scraped_at']
+
+
+class CsvSink:
+    """逐批追加写入CSV，内存中只保留当前批次，中途出错时已获取的数据也已落盘
+
+    每行需包含fieldnames中的全部字段
+    """
+
+    def __init__(self, path: str, fieldnames: Sequence[str] = CSV_FIELDNAMES):
+        self.path = path
+        self.count = 0
+        self._fieldnames = fieldnames
+        self._row = operator.itemgetter(*fieldnames)
+        self._file = None
+        self._writer = None
+
+    def open(self) -> 'CsvSink':
+        self._file = open(self.path, 'w', newline='', encoding='utf-8', buffering=1 << 20)
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self._fieldnames)
+        return self
+
+    def append(self, rows: List[Dict[str, Any]]):
+        """写入一批数据并刷新到文件"""
+        self._writer.writerows(map(self._row, rows))
+        self._file.flush()
+        self.count += len(rows)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard_if_empty(self) -> str:
+        """关闭文件；没有写入任何数据时删除文件并返回空字符串，否则返回文件路径"""
+        self.close()
+        if not self.count:
+            os.remove(self.path)
+            return ""
+        return self.path
+
+    def __enter__(self) -> 'CsvSink':
+        return self.open()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
 
 class GitHubFollowersListScraper:
     """GitHub第一阶段：批量获取followers/stargazers用户名列表（支持分页）"""
@@ -23,104 +104,84 @@ class GitHubFollowersListScraper:
         Returns:
             CSV文件路径
         """
-        print(f"🚀 第一阶段：开始爬取 {username} 的followers列表...")
-        
-        playwright = await async_playwright().start()
-        browser = await playwright.chromium.launch(headless=True)
-        page = await browser.new_page()
+        logger.debug("🚀 第一阶段：开始爬取 %s 的followers列表...", username)
         
-        # 设置用户代理
-        await page.set_extra_http_headers({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
+        try:
+            csv_file = os.path.join(self.data_dir, f"{username}_followers_raw.csv")
+            # 同一次爬取的所有行共用一个时间戳
+            scraped_at = datetime.now().isoformat()
+            # 每获取一页就写入CSV，而不是全部收集完再统一保存
+            make_row = lambda login, page_num: self._user_row(login, 'follower', page_num, scraped_at, source_user=username)
+            with CsvSink(csv_file) as sink:
+                try:
+                    await self._list_users_via_api(f"/users/{username}/followers", max_pages, sink, make_row)
+                except GitHubAPIError as e:
+                    logger.warning("GitHub API不可用，改用页面爬取: %s", e)
+                    # 列表页是服务端渲染的，先直接请求HTML解析，被拦截时才启动浏览器
+                    if not await self._list_users_via_html(
+                        lambda page_num: f"https://github.com/{username}?page={page_num}&tab=followers", max_pages, sink, make_row
+                    ):
+                        await self._scrape_followers_pages(username, max_pages, sink, scraped_at)
+            
+            if not sink.discard_if_empty():
+                return ""
+            
+            logger.debug("✅ 第一阶段完成！总共获取 %s 个followers，保存到: %s", sink.count, csv_file)
+            return csv_file
+            
+        except Exception as e:
+            logger.warning("爬取过程中出错: %s", e)
+            return ""
+    
+    async def _scrape_followers_pages(self, username: str, max_pages: int, sink: CsvSink, scraped_at: str):
+        """通过页面爬取followers列表（API不可用时的备选方案）"""
+        context = await new_context(block_resources=True)
+        page = await context.new_page()
         
-        followers = []
+        # 跨页去重：GitHub在翻页期间列表变化时，同一用户可能出现在相邻两页
+        seen_usernames = set()
+        add_seen = seen_usernames.add
         
         try:
             for page_num in range(1, max_pages + 1):
                 # GitHub followers分页URL格式
                 url = f"https://github.com/{username}?page={page_num}&tab=followers"
-                print(f"📄 正在爬取第 {page_num} 页: {url}")
+                logger.debug("📄 正在爬取第 %s 页: %s", page_num, url)
                 
-                await page.goto(url, wait_until="networkidle", timeout=30000)
-                await asyncio.sleep(2)
+                # 用户链接在服务端渲染的HTML中，DOM解析完成即可读取
+                await page.goto(url, wait_until="domcontentloaded", timeout=30000)
                 
                 # 获取当前页面的用户链接
-                user_links = await page.query_selector_all('a[data-hovercard-type="user"]')
+                user_links = await page.eval_on_selector_all('a[data-hovercard-type="user"]', 'els => els.map(e => e.getAttribute("href"))')
                 
                 if not user_links:
-                    print(f"第 {page_num} 页没有找到用户链接，停止爬取")
+                    logger.debug("第 %s 页没有找到用户链接，停止爬取", page_num)
                     break
                 
                 page_followers = []
-                seen_usernames = set()
-                
-                for link in user_links:
-                    try:
-                        href = await link.get_attribute('href')
-                        if href and href.startswith('/'):
-                            follower_username = href.strip('/')
-                            if follower_username and follower_username not in seen_usernames:
-                                seen_usernames.add(follower_username)
-                                page_followers.append({
-                                    'username': follower_username,
-                                    'profile_url': f'https://github.com/{follower_username}',
-                                    'type': 'follower',
-                                    'source_user': username,
-                                    'page_number': page_num,
-                                    'scraped_at': datetime.now().isoformat()
-                                })
-                    except Exception as e:
-                        print(f"处理用户链接时出错: {e}")
+                for href in user_links:
+                    if not href or href[0] != '/':
                         continue
+                    follower_username = href[1:].split('/', 1)[0]
+                    if follower_username and follower_username not in seen_usernames:
+                        add_seen(follower_username)
+                        page_followers.append(
+                            self._user_row(follower_username, 'follower', page_num, scraped_at, source_user=username)
+                        )
                 
-                print(f"第 {page_num} 页获取到 {len(page_followers)} 个followers")
-                followers.extend(page_followers)
+                logger.debug("第 %s 页获取到 %s 个followers", page_num, len(page_followers))
+                sink.append(page_followers)
                 
                 # 检查是否还有下一页
-                next_selectors = [
-                    '.pagination a:last-child',  # GitHub的下一页按钮
-                    'a[href*="page=' + str(page_num + 1) + '"]',  # 包含下一页页码的链接
-                    '.pagination a[rel="next"]'  # 标准的next链接
-                ]
-                
-                has_next_page = False
-                for selector in next_selectors:
-                    try:
-                        next_button = await page.query_selector(selector)
-                        if next_button:
-                            button_text = await next_button.text_content()
-                            button_href = await next_button.get_attribute('href')
-                            print(f"找到下一页按钮: text='{button_text}', href='{button_href}'")
-                            
-                            # 检查是否真的是下一页链接
-                            if (button_text and 'next' in button_text.lower()) or \
-                               (button_href and f'page={page_num + 1}' in button_href):
-                                has_next_page = True
-                                break
-                    except Exception as e:
-                        print(f"检查选择器 {selector} 时出错: {e}")
-                        continue
-                
-                if not has_next_page:
-                    print(f"没有下一页，总共爬取了 {page_num} 页")
+                if not await page_has_next(page):
+                    logger.debug("没有下一页，总共爬取了 %s 页", page_num)
                     break
                 
                 # 避免请求过快
                 await asyncio.sleep(1)
             
-            # 保存到CSV文件
-            csv_file = await self._save_to_csv(followers, f"{username}_followers_raw.csv")
-            print(f"✅ 第一阶段完成！总共获取 {len(followers)} 个followers，保存到: {csv_file}")
-            
-            return csv_file
-            
-        except Exception as e:
-            print(f"爬取过程中出错: {e}")
-            return ""
         finally:
-            await browser.close()
-            await playwright.stop()
+            await context.close()
     
     async def scrape_stargazers_list(self, owner: str, repo: str, max_pages: int = 10) -> str:
         """
@@ -134,125 +195,176 @@ class GitHubFollowersListScraper:
         Returns:
             CSV文件路径
         """
-        print(f"🚀 第一阶段：开始爬取 {owner}/{repo} 的stargazers列表...")
-        
-        playwright = await async_playwright().start()
-        browser = await playwright.chromium.launch(headless=True)
-        page = await browser.new_page()
+        logger.debug("🚀 第一阶段：开始爬取 %s/%s 的stargazers列表...", owner, repo)
         
-        # 设置用户代理
-        await page.set_extra_http_headers({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
+        try:
+            csv_file = os.path.join(self.data_dir, f"{owner}_{repo}_stargazers_raw.csv")
+            # 同一次爬取的所有行共用一个时间戳
+            scraped_at = datetime.now().isoformat()
+            # 每获取一页就写入CSV，而不是全部收集完再统一保存
+            make_row = lambda login, page_num: self._user_row(login, 'stargazer', page_num, scraped_at, source_repo=f'{owner}/{repo}')
+            with CsvSink(csv_file) as sink:
+                try:
+                    await self._list_users_via_api(f"/repos/{owner}/{repo}/stargazers", max_pages, sink, make_row)
+                except GitHubAPIError as e:
+                    logger.warning("GitHub API不可用，改用页面爬取: %s", e)
+                    # 列表页是服务端渲染的，先直接请求HTML解析，被拦截时才启动浏览器
+                    if not await self._list_users_via_html(
+                        lambda page_num: f"https://github.com/{owner}/{repo}/stargazers?page={page_num}", max_pages, sink, make_row
+                    ):
+                        await self._scrape_stargazers_pages(owner, repo, max_pages, sink, scraped_at)
+            
+            if not sink.discard_if_empty():
+                return ""
+            
+            logger.debug("✅ 第一阶段完成！总共获取 %s 个stargazers，保存到: %s", sink.count, csv_file)
+            return csv_file
+            
+        except Exception as e:
+            logger.warning("爬取过程中出错: %s", e)
+            return ""
+    
+    async def _scrape_stargazers_pages(self, owner: str, repo: str, max_pages: int, sink: CsvSink, scraped_at: str):
+        """通过页面爬取stargazers列表（API不可用时的备选方案）"""
+        context = await new_context(block_resources=True)
+        page = await context.new_page()
         
-        stargazers = []
+        # 跨页去重：GitHub在翻页期间列表变化时，同一用户可能出现在相邻两页
+        seen_usernames = set()
+        add_seen = seen_usernames.add
         
         try:
             for page_num in range(1, max_pages + 1):
                 # GitHub stargazers分页URL格式
                 url = f"https://github.com/{owner}/{repo}/stargazers?page={page_num}"
-                print(f"📄 正在爬取第 {page_num} 页: {url}")
+                logger.debug("📄 正在爬取第 %s 页: %s", page_num, url)
                 
-                await page.goto(url, wait_until="networkidle", timeout=30000)
-                await asyncio.sleep(2)
+                # 用户链接在服务端渲染的HTML中，DOM解析完成即可读取
+                await page.goto(url, wait_until="domcontentloaded", timeout=30000)
                 
                 # 获取当前页面的用户链接
-                user_links = await page.query_selector_all('a[data-hovercard-type="user"]')
+                user_links = await page.eval_on_selector_all('a[data-hovercard-type="user"]', 'els => els.map(e => e.getAttribute("href"))')
                 
                 if not user_links:
-                    print(f"第 {page_num} 页没有找到用户链接，停止爬取")
+                    logger.debug("第 %s 页没有找到用户链接，停止爬取", page_num)
                     break
                 
                 page_stargazers = []
-                seen_usernames = set()
-                
-                for link in user_links:
-                    try:
-                        href = await link.get_attribute('href')
-                        if href and href.startswith('/'):
-                            stargazer_username = href.strip('/')
-                            if stargazer_username and stargazer_username not in seen_usernames:
-                                seen_usernames.add(stargazer_username)
-                                page_stargazers.append({
-                                    'username': stargazer_username,
-                                    'profile_url': f'https://github.com/{stargazer_username}',
-                                    'type': 'stargazer',
-                                    'source_repo': f'{owner}/{repo}',
-                                    'page_number': page_num,
-                                    'scraped_at': datetime.now().isoformat()
-                                })
-                    except Exception as e:
-                        print(f"处理用户链接时出错: {e}")
+                for href in user_links:
+                    if not href or href[0] != '/':
                         continue
+                    stargazer_username = href[1:].split('/', 1)[0]
+                    if stargazer_username and stargazer_username not in seen_usernames:
+                        add_seen(stargazer_username)
+                        page_stargazers.append(
+                            self._user_row(stargazer_username, 'stargazer', page_num, scraped_at, source_repo=f'{owner}/{repo}')
+                        )
                 
-                print(f"第 {page_num} 页获取到 {len(page_stargazers)} 个stargazers")
-                stargazers.extend(page_stargazers)
+                logger.debug("第 %s 页获取到 %s 个stargazers", page_num, len(page_stargazers))
+                sink.append(page_stargazers)
                 
                 # 检查是否还有下一页
-                next_selectors = [
-                    '.pagination a:last-child',  # GitHub的下一页按钮
-                    'a[href*="page=' + str(page_num + 1) + '"]',  # 包含下一页页码的链接
-                    '.pagination a[rel="next"]'  # 标准的next链接
-                ]
-                
-                has_next_page = False
-                for selector in next_selectors:
-                    try:
-                        next_button = await page.query_selector(selector)
-                        if next_button:
-                            button_text = await next_button.text_content()
-                            button_href = await next_button.get_attribute('href')
-                            print(f"找到下一页按钮: text='{button_text}', href='{button_href}'")
-                            
-                            # 检查是否真的是下一页链接
-                            if (button_text and 'next' in button_text.lower()) or \
-                               (button_href and f'page={page_num + 1}' in button_href):
-                                has_next_page = True
-                                break
-                    except Exception as e:
-                        print(f"检查选择器 {selector} 时出错: {e}")
-                        continue
-                
-                if not has_next_page:
-                    print(f"没有下一页，总共爬取了 {page_num} 页")
+                if not await page_has_next(page):
+                    logger.debug("没有下一页，总共爬取了 %s 页", page_num)
                     break
                 
                 # 避免请求过快
                 await asyncio.sleep(1)
             
-            # 保存到CSV文件
-            csv_file = await self._save_to_csv(stargazers, f"{owner}_{repo}_stargazers_raw.csv")
-            print(f"✅ 第一阶段完成！总共获取 {len(stargazers)} 个stargazers，保存到: {csv_file}")
-            
-            return csv_file
-            
-        except Exception as e:
-            print(f"爬取过程中出错: {e}")
-            return ""
         finally:
-            await browser.close()
-            await playwright.stop()
+            await context.close()
     
-    async def _save_to_csv(self, data: List[Dict[str, Any]], filename: str) -> str:
-        """保存数据到CSV文件"""
-        if not data:
-            return ""
-        
-        csv_path = os.path.join(self.data_dir, filename)
-        
-        # 定义CSV字段
-        fieldnames = ['username', 'profile_url', 'type', 'source_user', 'source_repo', 'page_number', 'scraped_at']
-        
-        with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for item in data:
-                # 确保所有字段都存在
-                row = {field: item.get(field, '') for field in fieldnames}
-                writer.writerow(row)
-        
-        return csv_path
+    async def _list_users_via_api(self, path: str, max_pages: int, sink: CsvSink, make_row):
+        """通过GitHub API获取用户列表并写入CSV，多页时并发请求"""
+        for page_num, logins in await list_users(path, max_pages):
+            logger.debug("📄 API第 %s 页获取到 %s 个用户", page_num, len(logins))
+            sink.append([make_row(login, page_num) for login in logins])
+    
+    async def _list_users_via_html(self, page_url: Callable[[int], str], max_pages: int,
+                                   sink: CsvSink, make_row) -> bool:
+        """直接请求列表页HTML并解析用户链接，无需浏览器
+
+        第一页确认可以解析且有下一页后，其余页并发请求，按页码顺序写入
+
+        Returns:
+            是否成功；第一页就失败（请求被拦截或没有解析到用户）时返回False，由调用方改用浏览器爬取
+        """
+        from http_client import get_session
+        session = await get_session()
+        seen_usernames = set()
+
+        async def fetch_page(page_num: int) -> Optional[HTMLParser]:
+            url = page_url(page_num)
+            try:
+                async with session.get(url) as response:
+                    if response.status >= 400:
+                        raise aiohttp.ClientResponseError(
+                            response.request_info, response.history, status=response.status
+                        )
+                    return HTMLParser(await response.text())
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning("请求 %s 失败: %r", url, e)
+                return None
+
+        def append_page(page_num: int, tree: Optional[HTMLParser]) -> bool:
+            """写入一页的用户，该页没有用户时返回False"""
+            if tree is None:
+                return False
+            rows = []
+            for a in tree.css('a[data-hovercard-type="user"]'):
+                href = a.attributes.get('href')
+                if not href or href[0] != '/':
+                    continue
+                login = href[1:].split('/', 1)[0]
+                if login and login not in seen_usernames:
+                    seen_usernames.add(login)
+                    rows.append(make_row(login, page_num))
+
+            if not rows:
+                logger.debug("第 %s 页没有解析到用户链接，停止爬取", page_num)
+                return False
+
+            logger.debug("📄 HTML第 %s 页获取到 %s 个用户", page_num, len(rows))
+            sink.append(rows)
+            return True
+
+        first_page = await fetch_page(1)
+        if not append_page(1, first_page):
+            return False
+        if max_pages <= 1 or not html_has_next(first_page):
+            return True
+
+        semaphore = asyncio.Semaphore(PAGE_CONCURRENCY)
+
+        async def fetch_page_limited(page_num: int) -> Optional[HTMLParser]:
+            async with semaphore:
+                return await fetch_page(page_num)
+
+        tasks = [asyncio.create_task(fetch_page_limited(page_num)) for page_num in range(2, max_pages + 1)]
+        try:
+            for page_num, task in enumerate(tasks, start=2):
+                tree = await task
+                if not append_page(page_num, tree) or not html_has_next(tree):
+                    break
+        finally:
+            # 提前到达最后一页时取消多余的请求
+            for task in tasks:
+                task.cancel()
+
+        return True
+    
+    def _user_row(self, login: str, user_type: str, page_num: int, scraped_at: str,
+                  source_user: str = '', source_repo: str = '') -> Dict[str, Any]:
+        """构造第一阶段CSV中的一行，CSV_FIELDNAMES中的字段都会填充（CsvSink写入时依赖）"""
+        return {
+            'username': login,
+            'profile_url': f'https://github.com/{login}',
+            'type': user_type,
+            'source_user': source_user,
+            'source_repo': source_repo,
+            'page_number': page_num,
+            'scraped_at': scraped_at
+        }
 
 # 测试函数
 async def main():
@@ -261,6 +373,7 @@ async def main():
     # 测试爬取followers
     csv_file = await scraper.scrape_followers_list("connor4312", max_pages=3)
     print(f"结果文件: {csv_file}")
+    await close_browser()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
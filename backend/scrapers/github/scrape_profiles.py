@@ -1,11 +1,106 @@
+import logging
 import asyncio
 import csv
 import os
+import random
+import time
 from datetime import datetime
 from typing import List, Dict, Any
-from playwright.async_api import async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from browser_pool import close_browser, PagePool
+from cache import BoundedTTLCache
+from .api import GitHubAPIError, get_user
+from .get_followers_list import CsvSink
 import re
 
+logger = logging.getLogger(__name__)
+
+# GitHub用户资料变化较慢，同一用户在不同来源（followers/stargazers）间重复出现时复用
+PROFILE_CACHE_TTL = 3600
+_profile_cache = BoundedTTLCache(capacity=10000, ttl=PROFILE_CACHE_TTL)
+
+# 打开用户主页超时的重试次数，偶发的网络抖动不至于丢掉这个用户
+GOTO_ATTEMPTS = 3
+
+# 逐个用户的进度消息最短发送间隔（秒）
+PROGRESS_INTERVAL = 0.25
+
+# 详细资料CSV字段，_get_user_details返回的资料包含全部字段
+ENRICHED_FIELDNAMES = (
+    'username', 'display_name', 'bio', 'avatar_url', 'profile_url',
+    'platform', 'type', 'source_user', 'source_repo', 'page_number',
+    'follower_count', 'following_count', 'public_repos',
+    'company', 'location', 'website', 'twitter', 'email',
+    'scraped_at', 'profile_scraped_at'
+)
+
+# 用户主页各字段的候选选择器，按优先级排列
+_NAME_SELECTORS = (
+    'h1.vcard-names .p-name',
+    '.vcard-fullname',
+    '[data-testid="profile-name"]',
+    '.js-profile-editable-names .p-name',
+)
+_BIO_SELECTORS = (
+    '.p-note .user-profile-bio',
+    '[data-bio-text]',
+    '.js-user-profile-bio',
+    '.user-profile-bio',
+)
+_AVATAR_SELECTORS = (
+    '.avatar-user',
+    '.avatar img',
+    '[data-testid="profile-avatar"] img',
+)
+
+# 在页面内一次性提取资料所需的全部DOM数据，避免逐个元素的CDP往返
+_PROFILE_SNAPSHOT_JS = """({name, bio, avatar}) => {
+    const firstText = selectors => {
+        for (const sel of selectors) {
+            const el = document.querySelector(sel);
+            const text = el && el.textContent.trim();
+            if (text) return text;
+        }
+        return '';
+    };
+    const firstSrc = selectors => {
+        for (const sel of selectors) {
+            const el = document.querySelector(sel);
+            const src = el && el.getAttribute('src');
+            if (src) return src;
+        }
+        return '';
+    };
+    const mailto = el => {
+        const a = el && el.querySelector('a[href^="mailto:"]');
+        return a ? a.getAttribute('href') : '';
+    };
+    const details = [...document.querySelectorAll('.vcard-details li, .vcard-detail')];
+    return {
+        display_name: firstText(name),
+        bio: firstText(bio),
+        avatar_url: firstSrc(avatar),
+        links: [...document.querySelectorAll('a')].map(a => [a.getAttribute('href'), a.textContent]),
+        itemprop_email: mailto(document.querySelector('li[itemprop="email"]')),
+        vcard_email: details.map(mailto).find(href => href) || '',
+        details: details.map(e => [e.getAttribute('itemprop'), e.textContent]),
+    };
+}"""
+
+# 解析计数文本时反复使用，预先编译
+_COUNT_RE = re.compile(r'(\d+(?:\.\d+)?)\s*([kKmM]?)')
+_COMMAS_TRANS = str.maketrans('', '', ',')
+# 计数后缀对应的倍数，无后缀时为1
+_COUNT_MULTIPLIERS = {'': 1, 'k': 1000, 'K': 1000, 'm': 1000000, 'M': 1000000}
+
+# vcard详情项的关键词及对应字段，一次扫描找出文本中出现的全部关键词
+_DETAIL_KEYWORDS = {
+    'location': 'location', '位置': 'location', 'based in': 'location',
+    'company': 'company', '公司': 'company', 'work': 'company', 'org': 'company',
+    'http': 'website',
+}
+_DETAIL_RE = re.compile('|'.join(map(re.escape, _DETAIL_KEYWORDS)), re.IGNORECASE)
+
 class GitHubProfileScraper:
     """GitHub第二阶段：获取用户详细资料信息"""
 
@@ -24,24 +119,17 @@ class GitHubProfileScraper:
         if not text:
             return 0
 
-        text = text.strip().replace(',', '')
+        text = text.strip().translate(_COMMAS_TRANS)
 
         # 匹配数字格式，支持小数点和k/M后缀
-        match = re.search(r'(\d+(?:\.\d+)?)\s*([kKmM]?)', text)
+        match = _COUNT_RE.search(text)
         if not match:
             return 0
 
         number_str, suffix = match.groups()
 
         try:
-            number = float(number_str)
-
-            if suffix.lower() == 'k':
-                return int(number * 1000)
-            elif suffix.lower() == 'm':
-                return int(number * 1000000)
-            else:
-                return int(number)
+            return int(float(number_str) * _COUNT_MULTIPLIERS[suffix])
         except (ValueError, TypeError):
             return 0
 
@@ -57,7 +145,7 @@ class GitHubProfileScraper:
         Yields:
             包含进度信息的字典
         """
-        print(f"🔍 第二阶段：开始从 {csv_file_path} 获取用户详细资料...")
+        logger.debug("🔍 第二阶段：开始从 %s 获取用户详细资料...", csv_file_path)
 
         # 读取第一阶段的用户列表
         usernames = await self._read_usernames_from_csv(csv_file_path)
@@ -81,19 +169,33 @@ class GitHubProfileScraper:
             'processed_count': 0
         }
 
-        playwright = await async_playwright().start()
-        browser = await playwright.chromium.launch(headless=True)
-        page = await browser.new_page()
+        # 同一批次内的用户并发获取，每个并发位置复用一个页面
+        pages = PagePool(batch_size, block_resources=True)
 
-        # 设置用户代理
-        await page.set_extra_http_headers({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
+        async def fetch(username_data: Dict[str, Any]):
+            try:
+                return username_data, await self._get_user_details_from_pool(pages, username_data), None
+            except Exception as e:
+                return username_data, None, e
 
-        enriched_users = []
+        # 每获取到一个用户就写入CSV，而不是全部完成后统一保存
+        sink = CsvSink(self._enriched_csv_path(csv_file_path), ENRICHED_FIELDNAMES)
         processed_count = 0
+        progress_pct = 0.0
+
+        # 进度消息节流，避免SSE被大量中间状态刷屏
+        last_emit = 0.0
+
+        def should_emit() -> bool:
+            nonlocal last_emit
+            now = time.monotonic()
+            if now - last_emit < PROGRESS_INTERVAL:
+                return False
+            last_emit = now
+            return True
 
         try:
+            sink.open()
             # 分批处理用户
             for i in range(0, len(usernames), batch_size):
                 batch = usernames[i:i + batch_size]
@@ -102,84 +204,78 @@ class GitHubProfileScraper:
                 yield {
                     'type': 'progress',
                     'message': f'处理批次 {batch_num}: {len(batch)} 个用户',
-                    'progress': (processed_count / total_users) * 100,
+                    'progress': progress_pct,
                     'total_count': total_users,
                     'processed_count': processed_count
                 }
 
                 for username_data in batch:
-                    username = username_data['username']
-                    try:
+                    # 逐个用户的进度消息只是提示，节流后再发送；完成/失败事件始终发送
+                    if should_emit():
                         yield {
                             'type': 'progress',
-                            'message': f'正在获取用户资料: {username}',
-                            'progress': (processed_count / total_users) * 100,
-                            'current_user': username,
+                            'message': f'正在获取用户资料: {username_data["username"]}',
+                            'progress': progress_pct,
+                            'current_user': username_data['username'],
                             'total_count': total_users,
                             'processed_count': processed_count
                         }
 
-                        user_details = await self._get_user_details(username, page, username_data)
-                        if user_details:
-                            enriched_users.append(user_details)
-                            processed_count += 1
-
-                            yield {
-                                'type': 'user_completed',
-                                'message': f'✅ 成功获取 {username} 的资料',
-                                'progress': (processed_count / total_users) * 100,
-                                'current_user': username,
-                                'total_count': total_users,
-                                'processed_count': processed_count,
-                                'user_data': user_details
-                            }
-                        else:
-                            processed_count += 1
-                            yield {
-                                'type': 'user_failed',
-                                'message': f'❌ 获取 {username} 的资料失败',
-                                'progress': (processed_count / total_users) * 100,
-                                'current_user': username,
-                                'total_count': total_users,
-                                'processed_count': processed_count
-                            }
-                    except Exception as e:
-                        processed_count += 1
+                # 批次内并发获取，按完成顺序报告每个用户的结果
+                for future in asyncio.as_completed([fetch(username_data) for username_data in batch]):
+                    username_data, user_details, error = await future
+                    username = username_data['username']
+                    processed_count += 1
+                    progress_pct = processed_count * 100.0 / total_users
+
+                    if error is not None:
                         yield {
                             'type': 'user_error',
-                            'message': f'获取 {username} 资料时出错: {e}',
-                            'progress': (processed_count / total_users) * 100,
+                            'message': f'获取 {username} 资料时出错: {error}',
+                            'progress': progress_pct,
+                            'current_user': username,
+                            'total_count': total_users,
+                            'processed_count': processed_count
+                        }
+                    elif user_details:
+                        sink.append([user_details])
+                        yield {
+                            'type': 'user_completed',
+                            'message': f'✅ 成功获取 {username} 的资料',
+                            'progress': progress_pct,
+                            'current_user': username,
+                            'total_count': total_users,
+                            'processed_count': processed_count,
+                            'user_data': user_details
+                        }
+                    else:
+                        yield {
+                            'type': 'user_failed',
+                            'message': f'❌ 获取 {username} 的资料失败',
+                            'progress': progress_pct,
                             'current_user': username,
                             'total_count': total_users,
                             'processed_count': processed_count
                         }
-                        continue
 
                 # 批次间暂停
                 if i + batch_size < len(usernames):
-                    yield {
-                        'type': 'progress',
-                        'message': '批次间暂停...',
-                        'progress': (processed_count / total_users) * 100,
-                        'total_count': total_users,
-                        'processed_count': processed_count
-                    }
                     await asyncio.sleep(2)
 
-            # 保存详细资料到新的CSV文件
+            # 详细资料已逐个写入CSV，这里只需关闭文件
             yield {
                 'type': 'progress',
-                'message': f'保存 {len(enriched_users)} 个用户的详细资料...',
+                'message': f'保存 {sink.count} 个用户的详细资料...',
                 'progress': 95,
                 'total_count': total_users,
                 'processed_count': processed_count
             }
 
-            output_file = await self._save_enriched_csv(enriched_users, csv_file_path)
+            output_file = sink.discard_if_empty()
 
             yield {
                 'type': 'complete',
-                'message': f'✅ 第二阶段完成！获取了 {len(enriched_users)} 个用户的详细资料',
+                'message': f'✅ 第二阶段完成！获取了 {sink.count} 个用户的详细资料',
                 'progress': 100,
                 'total_count': total_users,
                 'processed_count': processed_count,
@@ -192,8 +288,8 @@ class GitHubProfileScraper:
                 'message': f'第二阶段处理过程中出错: {e}'
             }
         finally:
-            await browser.close()
-            await playwright.stop()
+            sink.close()
+            await pages.close()
 
     async def scrape_profiles_from_csv(self, csv_file_path: str, max_users: int = 100, batch_size: int = 5) -> str:
         """
@@ -207,102 +303,198 @@ class GitHubProfileScraper:
         Returns:
             包含详细资料的CSV文件路径
         """
-        print(f"🔍 第二阶段：开始从 {csv_file_path} 获取用户详细资料...")
+        logger.debug("🔍 第二阶段：开始从 %s 获取用户详细资料...", csv_file_path)
 
         # 读取第一阶段的用户列表
         usernames = await self._read_usernames_from_csv(csv_file_path)
 
         if not usernames:
-            print("没有找到用户名列表")
+            logger.debug("没有找到用户名列表")
             return ""
 
         # 限制处理数量
         usernames = usernames[:max_users]
-        print(f"将处理 {len(usernames)} 个用户")
+        logger.debug("将处理 %s 个用户", len(usernames))
 
-        playwright = await async_playwright().start()
-        browser = await playwright.chromium.launch(headless=True)
-        page = await browser.new_page()
-
-        # 设置用户代理
-        await page.set_extra_http_headers({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
-
-        enriched_users = []
+        # 每个并发位置复用同一个页面，批次之间不再反复新建/关闭页面
+        pages = PagePool(batch_size, block_resources=True)
+        # 每完成一批就写入CSV，而不是全部完成后统一保存
+        sink = CsvSink(self._enriched_csv_path(csv_file_path), ENRICHED_FIELDNAMES)
 
         try:
-            # 分批处理用户
+            sink.open()
+            # 分批处理用户，同一批次内的用户并发获取
             for i in range(0, len(usernames), batch_size):
                 batch = usernames[i:i + batch_size]
-                print(f"处理批次 {i//batch_size + 1}: {len(batch)} 个用户")
+                logger.debug("处理批次 %s: %s 个用户", i//batch_size + 1, len(batch))
 
-                for username_data in batch:
+                results = await asyncio.gather(
+                    *(self._get_user_details_from_pool(pages, username_data) for username_data in batch),
+                    return_exceptions=True
+                )
+
+                batch_users = []
+                for username_data, user_details in zip(batch, results):
                     username = username_data['username']
-                    try:
-                        print(f"正在获取用户资料: {username}")
-                        user_details = await self._get_user_details(username, page, username_data)
-                        if user_details:
-                            enriched_users.append(user_details)
-                            print(f"✅ 成功获取 {username} 的资料")
-                        else:
-                            print(f"❌ 获取 {username} 的资料失败")
-                    except Exception as e:
-                        print(f"获取 {username} 资料时出错: {e}")
-                        continue
+                    if isinstance(user_details, Exception):
+                        logger.warning("获取 %s 资料时出错: %s", username, user_details)
+                    elif user_details:
+                        batch_users.append(user_details)
+                        logger.debug("✅ 成功获取 %s 的资料", username)
+                    else:
+                        logger.warning("❌ 获取 %s 的资料失败", username)
+                sink.append(batch_users)
 
                 # 批次间暂停
                 if i + batch_size < len(usernames):
-                    print("批次间暂停...")
+                    logger.debug("批次间暂停...")
                     await asyncio.sleep(2)
 
-            # 保存详细资料到新的CSV文件
-            output_file = await self._save_enriched_csv(enriched_users, csv_file_path)
-            print(f"✅ 第二阶段完成！获取了 {len(enriched_users)} 个用户的详细资料")
+            # 详细资料已逐批写入CSV，这里只需关闭文件
+            output_file = sink.discard_if_empty()
+            logger.debug("✅ 第二阶段完成！获取了 %s 个用户的详细资料", sink.count)
 
             return output_file
 
         except Exception as e:
-            print(f"第二阶段处理过程中出错: {e}")
+            logger.warning("第二阶段处理过程中出错: %s", e)
             return ""
         finally:
-            await browser.close()
-            await playwright.stop()
+            sink.close()
+            await pages.close()
 
-    async def _read_usernames_from_csv(self, csv_file_path: str) -> List[Dict[str, Any]]:
-        """从CSV文件读取用户名列表"""
-        usernames = []
+    async def _get_user_details_from_pool(self, pages: PagePool, username_data: Dict[str, Any]) -> Dict:
+        """使用页面池获取用户资料，便于并发执行"""
+        logger.debug("正在获取用户资料: %s", username_data['username'])
+        return await self._get_user_details(username_data['username'], pages, username_data)
 
+    async def _read_usernames_from_csv(self, csv_file_path: str) -> List[Dict[str, Any]]:
+        """从CSV文件读取用户名列表，同一用户只保留第一次出现的记录"""
         try:
-            with open(csv_file_path, 'r', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    if row.get('username'):
-                        usernames.append({
-                            'username': row['username'],
-                            'type': row.get('type', 'user'),
-                            'source_user': row.get('source_user', ''),
-                            'source_repo': row.get('source_repo', ''),
-                            'page_number': row.get('page_number', ''),
-                            'scraped_at': row.get('scraped_at', '')
-                        })
-
-            print(f"从CSV文件读取到 {len(usernames)} 个用户名")
+            # 在线程中读文件，避免阻塞事件循环
+            usernames = await asyncio.to_thread(self._read_usernames_sync, csv_file_path)
+            logger.debug("从CSV文件读取到 %s 个用户名", len(usernames))
             return usernames
 
         except Exception as e:
-            print(f"读取CSV文件时出错: {e}")
+            logger.warning("读取CSV文件时出错: %s", e)
             return []
 
+    def _read_usernames_sync(self, csv_file_path: str) -> List[Dict[str, Any]]:
+        usernames = []
+        # GitHub用户名不区分大小写，重复的用户不必再获取一次资料
+        seen = set()
+
+        with open(csv_file_path, 'r', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
+            reader = csv.reader(csvfile)
+            header = next(reader, None)
+            if not header:
+                return usernames
+
+            # 按列位置取值，不为每行构造dict
+            columns = {name: index for index, name in enumerate(header)}
+            if 'username' not in columns:
+                return usernames
+            username_col = columns['username']
+            optional_cols = [
+                (field, columns.get(field), default)
+                for field, default in (
+                    ('type', 'user'), ('source_user', ''), ('source_repo', ''),
+                    ('page_number', ''), ('scraped_at', ''),
+                )
+            ]
+
+            for row in reader:
+                if len(row) <= username_col:
+                    continue
+                username = row[username_col]
+                key = username.lower()
+                if not username or key in seen:
+                    continue
+                seen.add(key)
+
+                record = {'username': username}
+                for field, col, default in optional_cols:
+                    record[field] = row[col] if col is not None and col < len(row) else default
+                usernames.append(record)
+
+        return usernames
+
     async def _get_user_details(self, username: str, page_obj, original_data: Dict) -> Dict:
-        """获取用户详细信息"""
+        """获取用户详细信息，近期获取过的用户直接使用缓存的资料
+
+        优先通过REST API获取，API不可用时才爬取用户主页。page_obj可以是页面或PagePool，
+        传入页面池时只在需要爬取页面时才借用页面，API可用时不会创建任何页面。
+        """
+        key = username.lower()
+        profile = _profile_cache.get(key)
+        if profile is None:
+            try:
+                profile = await self._get_user_details_via_api(username)
+            except GitHubAPIError as e:
+                logger.debug("API获取用户 %s 资料失败，回退到页面爬取: %s", username, e)
+                if isinstance(page_obj, PagePool):
+                    async with page_obj.page() as page:
+                        profile = await self._scrape_user_details(username, page, original_data)
+                else:
+                    profile = await self._scrape_user_details(username, page_obj, original_data)
+            if not profile:
+                return None
+            _profile_cache.put(key, profile)
+        else:
+            logger.debug("命中用户资料缓存: %s", username)
+
+        # 资料来自缓存时，来源信息仍以本次请求为准
+        user_info = dict(profile)
+        user_info.update({
+            'type': original_data.get('type', 'user'),
+            'source_user': original_data.get('source_user', ''),
+            'source_repo': original_data.get('source_repo', ''),
+            'page_number': original_data.get('page_number', ''),
+            'scraped_at': original_data.get('scraped_at', ''),
+        })
+        return user_info
+
+    async def _get_user_details_via_api(self, username: str) -> Dict:
+        """通过REST API获取用户资料，直接读取JSON字段，无需渲染和解析页面"""
+        user = await get_user(username)
+        login = user.get('login') or username
+        twitter = user.get('twitter_username')
+        return {
+            'username': login,
+            'display_name': user.get('name') or login,
+            'bio': (user.get('bio') or '').strip(),
+            'avatar_url': user.get('avatar_url') or f"https://github.com/{login}.png",
+            'profile_url': user.get('html_url') or f"https://github.com/{login}",
+            'platform': 'github',
+            'follower_count': user.get('followers') or 0,
+            'following_count': user.get('following') or 0,
+            'company': user.get('company') or '',
+            'location': user.get('location') or '',
+            'website': user.get('blog') or '',
+            'twitter': f"@{twitter}" if twitter else '',
+            'email': user.get('email') or '',
+            'public_repos': user.get('public_repos') or 0,
+            'profile_scraped_at': datetime.now().isoformat()
+        }
+
+    async def _scrape_user_details(self, username: str, page_obj, original_data: Dict) -> Dict:
+        """访问用户主页获取详细信息"""
         try:
             # 访问用户主页
             user_url = f"https://github.com/{username}"
-            await page_obj.goto(user_url, wait_until='networkidle', timeout=15000)
-
-            # 等待页面加载
-            await asyncio.sleep(1)
+            # 资料区域是服务端渲染的，DOM解析完成即可提取，无需再等待特定元素
+            # （组织账号等页面没有该区域，等待只会白白耗到超时）
+            for attempt in range(GOTO_ATTEMPTS):
+                try:
+                    await page_obj.goto(user_url, wait_until='domcontentloaded', timeout=10000)
+                    break
+                except (PlaywrightTimeoutError, asyncio.TimeoutError) as e:
+                    if attempt == GOTO_ATTEMPTS - 1:
+                        logger.warning("打开 %s 主页多次超时: %s", username, e)
+                        return None
+                    # 指数退避并加随机抖动，避免并发任务同时重试
+                    await asyncio.sleep(0.2 * 2 ** attempt + random.random() * 0.1)
 
             # 初始化用户信息，保留第一阶段的数据
             user_info = {
@@ -328,92 +520,43 @@ class GitHubProfileScraper:
                 'profile_scraped_at': datetime.now().isoformat()
             }
 
-            # 获取显示名
-            try:
-                name_selectors = [
-                    'h1.vcard-names .p-name',
-                    '.vcard-fullname',
-                    '[data-testid="profile-name"]',
-                    '.js-profile-editable-names .p-name'
-                ]
-
-                for selector in name_selectors:
-                    name_element = await page_obj.query_selector(selector)
-                    if name_element:
-                        display_name = await name_element.text_content()
-                        if display_name and display_name.strip():
-                            user_info['display_name'] = display_name.strip()
-                            break
-            except Exception as e:
-                print(f"获取显示名时出错: {e}")
-
-            # 获取bio
-            try:
-                bio_selectors = [
-                    '.p-note .user-profile-bio',
-                    '[data-bio-text]',
-                    '.js-user-profile-bio',
-                    '.user-profile-bio'
-                ]
-
-                for selector in bio_selectors:
-                    bio_element = await page_obj.query_selector(selector)
-                    if bio_element:
-                        bio = await bio_element.text_content()
-                        if bio and bio.strip():
-                            user_info['bio'] = bio.strip()
-                            break
-            except Exception as e:
-                print(f"获取bio时出错: {e}")
-
-            # 获取头像URL
-            try:
-                avatar_selectors = [
-                    '.avatar-user',
-                    '.avatar img',
-                    '[data-testid="profile-avatar"] img'
-                ]
-
-                for selector in avatar_selectors:
-                    avatar_element = await page_obj.query_selector(selector)
-                    if avatar_element:
-                        avatar_url = await avatar_element.get_attribute('src')
-                        if avatar_url:
-                            user_info['avatar_url'] = avatar_url
-                            break
-            except Exception as e:
-                print(f"获取头像时出错: {e}")
+            # 一次求值取得显示名、bio、头像、所有链接和vcard详情
+            snapshot = await page_obj.evaluate(_PROFILE_SNAPSHOT_JS, {
+                'name': _NAME_SELECTORS,
+                'bio': _BIO_SELECTORS,
+                'avatar': _AVATAR_SELECTORS,
+            })
+            if snapshot['display_name']:
+                user_info['display_name'] = snapshot['display_name']
+            if snapshot['bio']:
+                user_info['bio'] = snapshot['bio']
+            if snapshot['avatar_url']:
+                user_info['avatar_url'] = snapshot['avatar_url']
+            links = snapshot['links']
 
             # 获取follower和following数量
+            followers_tab, followers_path = f'/{username}?tab=followers', f'/{username}/followers'
+            following_tab, following_path = f'/{username}?tab=following', f'/{username}/following'
             try:
-                # 查找包含followers的链接
-                links = await page_obj.query_selector_all('a')
-                for link in links:
-                    href = await link.get_attribute('href')
-                    text = await link.text_content()
-
+                for href, text in links:
                     if href and text:
                         text = text.strip()
-                        if f'/{username}?tab=followers' in href or f'/{username}/followers' in href:
+                        if followers_tab in href or followers_path in href:
                             # 直接解析整个文本，支持k/M格式
                             count = self._parse_github_count(text)
                             if count > 0:
                                 user_info['follower_count'] = count
-                        elif f'/{username}?tab=following' in href or f'/{username}/following' in href:
+                        elif following_tab in href or following_path in href:
                             # 直接解析整个文本，支持k/M格式
                             count = self._parse_github_count(text)
                             if count > 0:
                                 user_info['following_count'] = count
             except Exception as e:
-                print(f"获取关注数据时出错: {e}")
+                logger.warning("获取关注数据时出错: %s", e)
 
             # 获取公共仓库数量
             try:
-                repo_links = await page_obj.query_selector_all('a')
-                for link in repo_links:
-                    href = await link.get_attribute('href')
-                    text = await link.text_content()
-
+                for href, text in links:
                     if href and text and '?tab=repositories' in href:
                         # 直接解析整个文本，支持k/M格式
                         count = self._parse_github_count(text)
@@ -421,99 +564,70 @@ class GitHubProfileScraper:
                             user_info['public_repos'] = count
                             break
             except Exception as e:
-                print(f"获取仓库数量时出错: {e}")
+                logger.warning("获取仓库数量时出错: %s", e)
 
-                        # 获取email地址
+            # 获取email地址
             try:
                 # 多种策略获取email
                 email_found = False
 
                 # 策略1: 通过itemprop="email"属性精确查找
-                email_item = await page_obj.query_selector('li[itemprop="email"]')
-                if email_item and not email_found:
-                    email_link = await email_item.query_selector('a[href^="mailto:"]')
-                    if email_link:
-                        href = await email_link.get_attribute('href')
-                        if href and href.startswith('mailto:'):
-                            email = href.replace('mailto:', '').strip()
-                            if email:
-                                user_info['email'] = email
-                                print(f"通过itemprop找到email: {email}")
-                                email_found = True
-
                 # 策略2: 在vcard-detail中查找mailto链接
-                if not email_found:
-                    vcard_details = await page_obj.query_selector_all('.vcard-detail, .vcard-details li')
-                    for detail in vcard_details:
-                        email_link = await detail.query_selector('a[href^="mailto:"]')
-                        if email_link:
-                            href = await email_link.get_attribute('href')
-                            if href and href.startswith('mailto:'):
-                                email = href.replace('mailto:', '').strip()
-                                if email:
-                                    user_info['email'] = email
-                                    print(f"通过vcard-detail找到email: {email}")
-                                    email_found = True
-                                    break
+                for strategy, href in (('itemprop', snapshot['itemprop_email']), ('vcard-detail', snapshot['vcard_email'])):
+                    email = href.replace('mailto:', '', 1).strip() if href else ''
+                    if email:
+                        user_info['email'] = email
+                        logger.debug("通过%s找到email: %s", strategy, email)
+                        email_found = True
+                        break
 
                 # 策略3: 全局查找mailto链接作为备选
                 if not email_found:
-                    all_mailto_links = await page_obj.query_selector_all('a[href^="mailto:"]')
-                    for link in all_mailto_links:
-                        href = await link.get_attribute('href')
+                    for href, _ in links:
                         if href and href.startswith('mailto:'):
                             email = href.replace('mailto:', '').strip()
                             # 简单验证email格式
                             if email and '@' in email and '.' in email:
                                 user_info['email'] = email
-                                print(f"通过全局搜索找到email: {email}")
+                                logger.debug("通过全局搜索找到email: %s", email)
                                 email_found = True
                                 break
 
                 if not email_found:
-                    print(f"未找到用户 {username} 的public email")
+                    logger.debug("未找到用户 %s 的public email", username)
 
             except Exception as e:
-                print(f"获取email时出错: {e}")
+                logger.warning("获取email时出错: %s", e)
 
             # 获取其他资料信息
             try:
                 # 公司、位置、网站等信息通常在vcard-details中
-                detail_items = await page_obj.query_selector_all('.vcard-details li, .vcard-detail')
-
-                for item in detail_items:
+                for itemprop, text in snapshot['details']:
                     # 跳过email项，因为我们已经单独处理了
-                    itemprop = await item.get_attribute('itemprop')
                     if itemprop == 'email':
                         continue
 
-                    text = await item.text_content()
                     if text:
                         text = text.strip()
-                        # 检查是否包含位置信息
-                        if any(keyword in text.lower() for keyword in ['location', '位置', 'based in']):
+                        fields = {_DETAIL_KEYWORDS[match.lower()] for match in _DETAIL_RE.findall(text)}
+                        # 按位置、公司、网站链接的优先级归类
+                        if 'location' in fields:
                             user_info['location'] = text
-                        # 检查是否包含公司信息
-                        elif any(keyword in text.lower() for keyword in ['company', '公司', 'work', 'org']):
+                        elif 'company' in fields:
                             user_info['company'] = text
-                        # 检查是否包含网站链接
-                        elif 'http' in text.lower():
+                        elif 'website' in fields:
                             user_info['website'] = text
             except Exception as e:
-                print(f"获取详细资料时出错: {e}")
+                logger.warning("获取详细资料时出错: %s", e)
 
             return user_info
 
         except Exception as e:
-            print(f"获取用户 {username} 详细信息时出错: {e}")
+            logger.warning("获取用户 %s 详细信息时出错: %s", username, e)
             return None
 
-    async def _save_enriched_csv(self, users: List[Dict[str, Any]], original_csv_path: str) -> str:
-        """保存增强后的用户数据到CSV文件"""
-        if not users:
-            return ""
-
-        # 生成输出文件名
+    def _enriched_csv_path(self, original_csv_path: str) -> str:
+        """根据第一阶段CSV文件名生成详细资料CSV路径"""
         base_name = os.path.basename(original_csv_path)
         name_parts = base_name.split('_raw.csv')
         if len(name_parts) == 2:
@@ -521,28 +635,7 @@ class GitHubProfileScraper:
         else:
             output_filename = f"enriched_{base_name}"
 
-        output_path = os.path.join(self.data_dir, output_filename)
-
-        # 定义CSV字段
-        fieldnames = [
-            'username', 'display_name', 'bio', 'avatar_url', 'profile_url',
-            'platform', 'type', 'source_user', 'source_repo', 'page_number',
-            'follower_count', 'following_count', 'public_repos',
-            'company', 'location', 'website', 'twitter', 'email',
-            'scraped_at', 'profile_scraped_at'
-        ]
-
-        with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-
-            for user in users:
-                # 确保所有字段都存在
-                row = {field: user.get(field, '') for field in fieldnames}
-                writer.writerow(row)
-
-        print(f"详细资料已保存到: {output_path}")
-        return output_path
+        return os.path.join(self.data_dir, output_filename)
 
 # 测试函数
 async def main():
@@ -555,6 +648,7 @@ async def main():
         print(f"结果文件: {result_file}")
     else:
         print("请先运行第一阶段获取用户列表")
+    await close_browser()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -1,21 +1,44 @@
+import logging
 import asyncio
+import csv
+import itertools
 import os
-import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+from urllib.parse import urlsplit, parse_qs
 from .base import BaseScraper
+from .github.api import GitHubAPIError, list_users_page
 from .github.get_followers_list import GitHubFollowersListScraper
 from .github.scrape_profiles import GitHubProfileScraper
-from playwright.async_api import async_playwright
+from browser_pool import new_context, PagePool
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+# 获取详细资料失败时返回的基本信息中与用户无关的字段
+_BASIC_USER_TEMPLATE = {
+    'bio': '',
+    'platform': 'github',
+    'follower_count': 0,
+    'following_count': 0,
+    'company': '',
+    'location': '',
+    'website': '',
+    'twitter': '',
+    'email': '',
+    'public_repos': 0,
+}
+
+# 最终结果每个partial消息携带的用户数
+RESULT_BATCH_SIZE = 500
+
 class GitHubTwoStageScraper(BaseScraper):
     """
     GitHub两阶段爬取器 - 完全统一的Profile获取架构 + 多线程并发优化
 
     ## 并发优化特性
     - **多线程用户详情获取**：使用asyncio并发获取用户详细信息，速度提升5-10倍
-    - **智能并发控制**：使用Semaphore限制并发数量，避免被GitHub限制
-    - **独立浏览器实例**：每个并发任务使用独立的browser context，避免冲突
+    - **智能并发控制**：API请求受共享连接池的单主机连接数限制，页面爬取受固定大小的页面池限制，避免被GitHub限制
+    - **共享浏览器实例**：所有任务共用一个Chromium，并发任务从页面池借用页面依次访问不同用户，避免反复创建页面
     - **错误处理与重试**：并发环境下的错误处理和自动重试机制
     - **进度实时更新**：支持并发环境下的实时进度报告
 
@@ -51,8 +74,8 @@ class GitHubTwoStageScraper(BaseScraper):
     所有类型的用户Profile获取逻辑已完全统一，实现了代码复用和数据一致性。
     """
 
-    def __init__(self, concurrent_limit: int = 8):
-        super().__init__()
+    def __init__(self, concurrent_limit: int = 8, session=None):
+        super().__init__(session)
         self.platform = "github"
         self.stage1_scraper = GitHubFollowersListScraper()
         self.stage2_scraper = GitHubProfileScraper()  # 统一的Profile获取器
@@ -73,10 +96,10 @@ class GitHubTwoStageScraper(BaseScraper):
             limit = 1
         elif limit > 20:
             limit = 20
-            print("⚠️ 并发数量限制在20以内，避免被GitHub限制")
+            logger.debug("⚠️ 并发数量限制在20以内，避免被GitHub限制")
 
         self.concurrent_limit = limit
-        print(f"📊 并发限制已设置为: {self.concurrent_limit}")
+        logger.debug("📊 并发限制已设置为: %s", self.concurrent_limit)
 
     def get_concurrent_limit(self) -> int:
         """获取当前并发限制数量"""
@@ -94,7 +117,7 @@ class GitHubTwoStageScraper(BaseScraper):
         Yields:
             包含进度信息的字典
         """
-        print(f"🚀 开始GitHub两阶段流式爬取: {url}")
+        logger.debug("🚀 开始GitHub两阶段流式爬取: %s", url)
 
         # 发送开始消息
         yield {
@@ -106,13 +129,13 @@ class GitHubTwoStageScraper(BaseScraper):
 
         # 分析URL类型
         scrape_type, owner, repo = self._parse_url_type(url)
-        print(f"识别URL类型: {scrape_type}, owner: {owner}, repo: {repo}")
+        logger.debug("识别URL类型: %s, owner: %s, repo: %s", scrape_type, owner, repo)
 
         stage1_csv = ""
 
         # 根据max_users计算需要的页数（GitHub每页大约50个用户）
         calculated_pages = max(1, min(max_pages, (max_users + 49) // 50))
-        print(f"根据max_users={max_users}，计算需要爬取 {calculated_pages} 页")
+        logger.debug("根据max_users=%s，计算需要爬取 %s 页", max_users, calculated_pages)
 
         yield {
             'type': 'progress',
@@ -122,7 +145,7 @@ class GitHubTwoStageScraper(BaseScraper):
         }
 
         if scrape_type == "forks":
-            print(f"识别为仓库forks页面: {owner}/{repo}")
+            logger.debug("识别为仓库forks页面: %s/%s", owner, repo)
 
             yield {
                 'type': 'progress',
@@ -160,6 +183,7 @@ class GitHubTwoStageScraper(BaseScraper):
             }
 
             # 转换为标准格式并获取详细信息
+            scraped_at = self.get_current_time()
             fork_users_data = []
             for fork_user in fork_users:
                 user_data = {
@@ -168,7 +192,7 @@ class GitHubTwoStageScraper(BaseScraper):
                     'source_user': owner,
                     'source_repo': repo,
                     'page_number': '1',
-                    'scraped_at': self.get_current_time(),
+                    'scraped_at': scraped_at,
                     # Fork特有信息
                     'fork_repo_name': fork_user.get('fork_repo_name', ''),
                     'fork_repo_url': fork_user.get('fork_repo_url', ''),
@@ -192,7 +216,7 @@ class GitHubTwoStageScraper(BaseScraper):
             return
 
         elif scrape_type == "repo" or scrape_type == "stargazers":
-            print(f"识别为仓库stargazers页面: {owner}/{repo}")
+            logger.debug("识别为仓库stargazers页面: %s/%s", owner, repo)
 
             yield {
                 'type': 'progress',
@@ -205,7 +229,7 @@ class GitHubTwoStageScraper(BaseScraper):
             stage1_csv = await self.stage1_scraper.scrape_stargazers_list(owner, repo, calculated_pages)
 
         elif scrape_type == "user" or scrape_type == "followers":
-            print(f"识别为用户followers页面: {owner}")
+            logger.debug("识别为用户followers页面: %s", owner)
 
             yield {
                 'type': 'progress',
@@ -246,18 +270,9 @@ class GitHubTwoStageScraper(BaseScraper):
             'progress': 60
         }
 
-        # 使用并发优化的第二阶段爬取
-        users_data = []
-        import csv
-
-        # 读取CSV文件并准备用户数据
+        # 读取CSV文件并准备用户数据（在线程中读文件，避免阻塞事件循环）
         try:
-            with open(stage1_csv, 'r', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    if len(users_data) >= max_users:
-                        break
-                    users_data.append(dict(row))
+            users_data = await asyncio.to_thread(self._read_stage1_rows, stage1_csv, max_users)
         except Exception as e:
             yield {
                 'type': 'error',
@@ -279,32 +294,10 @@ class GitHubTwoStageScraper(BaseScraper):
         detailed_users = await self._get_users_details_unified_with_progress(users_data, user_type,
                                                                            start_progress=70, end_progress=95)
 
-        # 通过异步生成器返回进度
+        # 通过异步生成器返回进度，最终结果由其直接分批发送，不再回读CSV文件
         async for progress_update in detailed_users:
             yield progress_update
 
-        # 读取最终结果
-        yield {
-            'type': 'progress',
-            'stage': 2,
-            'message': '读取最终结果...',
-            'progress': 95
-        }
-
-        final_data = await self._read_enriched_data(stage1_csv.replace('_raw.csv', '_enriched.csv'))
-
-        # 统一格式化数据
-        normalized_data = [self._normalize_user_data(user) for user in final_data]
-
-        yield {
-            'type': 'complete',
-            'data': normalized_data,
-            'total': len(normalized_data),
-            'message': f'爬取完成！共获取 {len(normalized_data)} 个用户的详细信息',
-            'progress': 100,
-            'platform': 'github'
-        }
-
     async def scrape(self, url: str, max_pages: int = 5, max_users: int = 100) -> List[Dict[str, Any]]:
         """
         执行完整的两阶段爬取流程
@@ -317,34 +310,35 @@ class GitHubTwoStageScraper(BaseScraper):
         Returns:
             包含详细信息的用户列表
         """
-        print(f"🚀 开始GitHub两阶段爬取: {url}")
+        logger.debug("🚀 开始GitHub两阶段爬取: %s", url)
 
         # 分析URL类型
         scrape_type, owner, repo = self._parse_url_type(url)
-        print(f"识别URL类型: {scrape_type}, owner: {owner}, repo: {repo}")
+        logger.debug("识别URL类型: %s, owner: %s, repo: %s", scrape_type, owner, repo)
 
         stage1_csv = ""
 
         # 根据max_users计算需要的页数（GitHub每页大约50个用户）
         calculated_pages = max(1, min(max_pages, (max_users + 49) // 50))  # 向上取整，但不超过max_pages
-        print(f"根据max_users={max_users}，计算需要爬取 {calculated_pages} 页")
+        logger.debug("根据max_users=%s，计算需要爬取 %s 页", max_users, calculated_pages)
 
         if scrape_type == "forks":
-            print(f"识别为仓库forks页面: {owner}/{repo}")
+            logger.debug("识别为仓库forks页面: %s/%s", owner, repo)
 
             # 直接使用内置的forks爬取方法
             fork_users = await self._scrape_forks_users(url, owner, repo, max_users)
 
             if not fork_users:
-                print("第一阶段失败，没有找到任何fork用户")
+                logger.warning("第一阶段失败，没有找到任何fork用户")
                 return []
 
             # 限制用户数量
             fork_users = fork_users[:max_users]
-            print(f"第一阶段完成，找到 {len(fork_users)} 个fork用户")
+            logger.debug("第一阶段完成，找到 %s 个fork用户", len(fork_users))
 
             # 第二阶段：获取用户详细信息（使用统一方法）
             # 转换为标准格式
+            scraped_at = self.get_current_time()
             fork_users_data = []
             for fork_user in fork_users:
                 user_data = {
@@ -353,7 +347,7 @@ class GitHubTwoStageScraper(BaseScraper):
                     'source_user': owner,
                     'source_repo': repo,
                     'page_number': '1',
-                    'scraped_at': self.get_current_time(),
+                    'scraped_at': scraped_at,
                     # Fork特有信息
                     'fork_repo_name': fork_user.get('fork_repo_name', ''),
                     'fork_repo_url': fork_user.get('fork_repo_url', ''),
@@ -362,35 +356,35 @@ class GitHubTwoStageScraper(BaseScraper):
                 fork_users_data.append(user_data)
 
             detailed_users = await self._get_users_details_unified(fork_users_data, 'fork_owner')
-            print(f"第二阶段完成，获取到 {len(detailed_users)} 个用户的详细信息")
+            logger.debug("第二阶段完成，获取到 %s 个用户的详细信息", len(detailed_users))
 
             # 统一格式化fork用户数据
             return [self._normalize_user_data(user, 'fork_owner') for user in detailed_users]
 
         elif scrape_type == "repo" or scrape_type == "stargazers":
-            print(f"识别为仓库stargazers页面: {owner}/{repo}")
+            logger.debug("识别为仓库stargazers页面: %s/%s", owner, repo)
 
             # 第一阶段：获取stargazers列表
             stage1_csv = await self.stage1_scraper.scrape_stargazers_list(owner, repo, calculated_pages)
 
         elif scrape_type == "user" or scrape_type == "followers":
-            print(f"识别为用户followers页面: {owner}")
+            logger.debug("识别为用户followers页面: %s", owner)
 
             # 第一阶段：获取followers列表
             stage1_csv = await self.stage1_scraper.scrape_followers_list(owner, calculated_pages)
 
         else:
-            print("无法识别URL类型")
+            logger.debug("无法识别URL类型")
             return []
 
         if not stage1_csv or not os.path.exists(stage1_csv):
-            print("第一阶段失败，没有生成用户列表文件")
+            logger.warning("第一阶段失败，没有生成用户列表文件")
             return []
 
-        print(f"第一阶段完成，生成文件: {stage1_csv}")
+        logger.debug("第一阶段完成，生成文件: %s", stage1_csv)
 
         # 第二阶段：获取用户详细信息（统一使用GitHubProfileScraper）
-        print("🔍 开始第二阶段：获取用户详细信息...")
+        logger.debug("🔍 开始第二阶段：获取用户详细信息...")
         stage2_csv = await self.stage2_scraper.scrape_profiles_from_csv(
             stage1_csv,
             max_users=max_users,
@@ -398,44 +392,62 @@ class GitHubTwoStageScraper(BaseScraper):
         )
 
         if not stage2_csv or not os.path.exists(stage2_csv):
-            print("第二阶段失败，没有生成详细信息文件")
+            logger.warning("第二阶段失败，没有生成详细信息文件")
             return []
 
-        print(f"第二阶段完成，生成文件: {stage2_csv}")
+        logger.debug("第二阶段完成，生成文件: %s", stage2_csv)
 
-        # 读取最终结果
-        final_data = await self._read_enriched_data(stage2_csv)
+        # 读取最终结果并统一格式化数据
+        return [
+            self._normalize_user_data(user)
+            for user in await self._read_enriched_data(stage2_csv)
+        ]
 
-        # 统一格式化数据
-        return [self._normalize_user_data(user) for user in final_data]
+    def _read_stage1_rows(self, csv_file_path: str, max_users: int) -> List[Dict[str, Any]]:
+        """读取第一阶段CSV的前max_users行"""
+        with open(csv_file_path, 'r', encoding='utf-8') as csvfile:
+            return [dict(row) for row in itertools.islice(csv.DictReader(csvfile), max_users)]
 
     async def _read_enriched_data(self, csv_file_path: str) -> List[Dict[str, Any]]:
-        """读取详细信息CSV文件并返回原始数据（格式化将在外部进行）"""
-        import csv
-
-        users = []
+        """读取详细信息CSV文件的原始数据（格式化将在外部进行）
 
+        整个文件在一次线程调用中读完，不阻塞事件循环；取消时也不会有生成器跨线程执行
+        """
         try:
-            with open(csv_file_path, 'r', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    # 直接读取原始数据，不做格式化处理
-                    users.append(dict(row))
-
-            print(f"成功读取 {len(users)} 个用户的详细信息")
+            users = await asyncio.to_thread(self._read_enriched_rows, csv_file_path)
+            logger.debug("成功读取 %s 个用户的详细信息", len(users))
             return users
-
         except Exception as e:
-            print(f"读取详细信息文件时出错: {e}")
+            logger.warning("读取详细信息文件时出错: %s", e)
             return []
 
+    def _read_enriched_rows(self, csv_file_path: str) -> List[Dict[str, Any]]:
+        """_read_enriched_data的同步部分"""
+        with open(csv_file_path, 'r', encoding='utf-8') as csvfile:
+            reader = csv.reader(csvfile)
+            header = next(reader, None)
+            if not header:
+                return []
+            # 直接读取原始数据，不做格式化处理；按表头与列位置组装，省去DictReader的中间字典
+            return [dict(zip(header, row)) for row in reader]
+
     def _safe_int(self, value: str) -> int:
         """安全转换字符串为整数"""
+        if not value:
+            return 0
         try:
-            return int(value) if value else 0
-        except:
+            return int(value.strip())
+        except (ValueError, TypeError, AttributeError):
             return 0
 
+    def _scraped_at(self, user_data: Dict[str, Any]) -> str:
+        """取用户数据的爬取时间，两个字段都没有时才生成当前时间"""
+        if 'scraped_at' in user_data:
+            return user_data['scraped_at']
+        if 'profile_scraped_at' in user_data:
+            return user_data['profile_scraped_at']
+        return self.get_current_time()
+
     def _normalize_user_data(self, user_data: Dict[str, Any], user_type: str = None) -> Dict[str, Any]:
         """
         统一用户数据格式，确保所有类型的爬取结果都有相同的字段结构
@@ -470,7 +482,7 @@ class GitHubTwoStageScraper(BaseScraper):
             'email': user_data.get('email', ''),
 
             # 元数据
-            'scraped_at': user_data.get('scraped_at', user_data.get('profile_scraped_at', self.get_current_time())),
+            'scraped_at': self._scraped_at(user_data),
             'source_user': user_data.get('source_user', ''),
             'source_repo': user_data.get('source_repo', ''),
             'page_number': user_data.get('page_number', ''),
@@ -504,96 +516,60 @@ class GitHubTwoStageScraper(BaseScraper):
         Returns:
             (scrape_type, owner, repo)
         """
-        url = url.rstrip('/')
-
-        # 检查是否是forks页面
-        if '/network/members' in url:
-            # https://github.com/owner/repo/network/members
-            pattern = r'https://github\.com/([^/]+)/([^/]+)/network/members'
-            match = re.match(pattern, url)
-            if match:
-                owner, repo = match.groups()
-                return "forks", owner, repo
+        # 路径与查询参数分开解析，?tab=followers、#readme 等不会混入owner/repo
+        split = urlsplit(url)
+        parts = [part for part in split.path.split('/') if part]
+        tab = parse_qs(split.query).get('tab', [''])[0]
 
-        # 检查是否包含forks关键词
-        if 'forks' in url or 'network' in url:
-            pattern = r'https://github\.com/([^/]+)/([^/]+)'
-            match = re.match(pattern, url)
-            if match:
-                owner, repo = match.groups()
+        if len(parts) >= 2:
+            owner, repo = parts[0], parts[1]
+            section = parts[2] if len(parts) >= 3 else ''
+
+            # https://github.com/owner/repo/network/members 或 /forks
+            if section in ('network', 'forks'):
                 return "forks", owner, repo
 
-        # 检查stargazers
-        if '/stargazers' in url or 'tab=stargazers' in url:
-            pattern = r'https://github\.com/([^/]+)/([^/]+)'
-            match = re.match(pattern, url)
-            if match:
-                owner, repo = match.groups()
+            # https://github.com/owner/repo/stargazers
+            if section == 'stargazers' or tab == 'stargazers':
                 return "stargazers", owner, repo
 
-        # 检查followers
-        if 'tab=followers' in url or '/followers' in url:
-            pattern = r'https://github.com/([^/]+)'
-            match = re.match(pattern, url)
-            if match:
-                owner = match.group(1)
+            # https://github.com/username/followers
+            if repo == 'followers':
                 return "followers", owner, ""
 
-        # 解析基本URL结构
-        url_parts = url.replace('https://github.com/', '').split('/')
-
-        if len(url_parts) >= 2:
             # https://github.com/owner/repo - 默认为stargazers
-            owner, repo = url_parts[0], url_parts[1]
             return "repo", owner, repo
-        elif len(url_parts) == 1:
+
+        if len(parts) == 1:
+            # https://github.com/username?tab=followers
+            if tab == 'followers':
+                return "followers", parts[0], ""
             # https://github.com/username - 默认为followers
-            owner = url_parts[0]
-            return "user", owner, ""
+            return "user", parts[0], ""
 
         raise ValueError(f"无法解析URL: {url}")
 
-    def _normalize_forks_url(self, url: str) -> str:
-        """规范化URL，确保指向/network/members页面"""
-        url = url.rstrip('/')
-
-        # 如果已经是network/members页面，直接返回
-        if '/network/members' in url:
-            return url
-
-        # 如果是基本的仓库URL，转换为network/members
-        pattern = r'https://github\.com/([^/]+)/([^/]+)'
-        match = re.match(pattern, url)
-        if match:
-            owner, repo = match.groups()
-            return f"https://github.com/{owner}/{repo}/network/members"
-
-        return None
-
     async def _scrape_forks_users(self, url: str, owner: str, repo: str, max_users: int = 100) -> List[Dict[str, str]]:
         """
         阶段1：爬取GitHub forks页面，获取所有fork用户的基本信息
         """
-        print(f"开始爬取forks页面: {url}")
+        logger.debug("开始爬取forks页面: %s", url)
 
-        # 规范化URL
-        normalized_url = self._normalize_forks_url(url)
-        if not normalized_url:
-            print("无法规范化forks URL")
-            return []
+        # owner/repo已由_parse_url_type解析，直接拼出network/members页面
+        normalized_url = f"https://github.com/{owner}/{repo}/network/members"
 
-        await self.setup_browser()
+        await self.setup_browser(block_resources=True)
 
         try:
-            await self.page.goto(normalized_url, wait_until="networkidle", timeout=30000)
-            await asyncio.sleep(3)
+            await self.page.goto(normalized_url, wait_until="domcontentloaded", timeout=30000)
+            await self.wait_for_element('#network', timeout=10000)
 
             # 检查页面是否正确加载
             page_title = await self.page.title()
-            print(f"页面标题: {page_title}")
+            logger.debug("页面标题: %s", page_title)
 
             # 自动滚动加载更多fork
-            print("正在滚动页面加载更多fork...")
+            logger.debug("正在滚动页面加载更多fork...")
             await self._scroll_to_load_forks()
 
             # 查找fork列表
@@ -601,12 +577,11 @@ class GitHubTwoStageScraper(BaseScraper):
             seen_users = set()
 
             # 使用指定的CSS选择器获取fork用户链接
-            user_links = await self.page.query_selector_all('#network div div a:nth-child(3)')
-            print(f"通过 '#network div div a:nth-child(3)' 找到 {len(user_links)} 个用户链接")
+            user_links = await self.page.eval_on_selector_all('#network div div a:nth-child(3)', 'els => els.map(e => e.getAttribute("href"))')
+            logger.debug("通过 '#network div div a:nth-child(3)' 找到 %s 个用户链接", len(user_links))
 
-            for link in user_links:
+            for href in user_links:
                 try:
-                    href = await link.get_attribute('href')
                     if not href or not href.startswith('/'):
                         continue
 
@@ -638,98 +613,62 @@ class GitHubTwoStageScraper(BaseScraper):
                             break
 
                 except Exception as e:
-                    print(f"处理用户链接时出错: {e}")
+                    logger.warning("处理用户链接时出错: %s", e)
                     continue
 
-            print(f"阶段1完成，找到 {len(fork_users)} 个唯一的fork用户")
+            logger.debug("阶段1完成，找到 %s 个唯一的fork用户", len(fork_users))
             return fork_users
 
         except Exception as e:
-            print(f"爬取fork用户列表时出错: {e}")
+            logger.warning("爬取fork用户列表时出错: %s", e)
             return []
         finally:
             await self.cleanup()
 
     async def _scroll_to_load_forks(self):
-        """滚动页面以加载更多fork"""
-        print("开始滚动加载更多fork...")
-        last_height = 0
-        scroll_count = 0
-        max_scrolls = 10
-
-        while scroll_count < max_scrolls:
-            # 滚动到页面底部
-            await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await asyncio.sleep(3)
-
-            # 检查页面高度是否变化
-            new_height = await self.page.evaluate("document.body.scrollHeight")
-
-            if new_height == last_height:
-                print("页面高度未变化，停止滚动")
-                break
-
-            last_height = new_height
-            scroll_count += 1
-            print(f"滚动次数: {scroll_count}, 页面高度: {new_height}")
-
-        print(f"滚动完成，总共滚动 {scroll_count} 次")
+        """滚动页面以加载更多fork，页面不再变高时停止"""
+        logger.debug("开始滚动加载更多fork...")
+        await self.scroll_to_load_more(max_scrolls=10)
 
     async def _get_single_user_concurrent(self, user_data: Dict[str, Any], user_type: str,
-                                         semaphore: asyncio.Semaphore, playwright_instance) -> Dict[str, Any]:
+                                         pages: PagePool) -> Dict[str, Any]:
         """
         并发获取单个用户详细信息的辅助方法
 
         Args:
             user_data: 用户基本信息
             user_type: 用户类型
-            semaphore: 并发控制信号量
-            playwright_instance: Playwright实例
+            pages: 页面池，只有API不可用、需要爬取页面时才借用页面
 
         Returns:
             用户详细信息，如果失败返回None
         """
-        async with semaphore:  # 限制并发数量
-            browser = None
-            try:
-                username = user_data.get('username', user_data.get('username'))
-
-                # 为每个并发任务创建独立的browser context
-                browser = await playwright_instance.chromium.launch(headless=True)
-                context = await browser.new_context()
-                page = await context.new_page()
-
-                # 设置用户代理
-                await page.set_extra_http_headers({
-                    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-                })
-
-                # 确保user_data包含必要字段
-                if 'type' not in user_data:
-                    user_data['type'] = user_type
-                if 'scraped_at' not in user_data:
-                    user_data['scraped_at'] = self.get_current_time()
-
-                # 使用GitHubProfileScraper统一获取详细信息
-                user_info = await self.stage2_scraper._get_user_details(username, page, user_data)
-
-                if user_info:
-                    # 保留原始数据中的特殊字段（如fork特有信息）
-                    for key, value in user_data.items():
-                        if key not in user_info and value:
-                            user_info[key] = value
-                    print(f"✅ 成功获取{user_type}用户 {username} 的详细信息")
-                    return user_info
-                else:
-                    print(f"❌ 无法获取{user_type}用户 {username} 的详细信息")
-                    return None
-
-            except Exception as e:
-                print(f"获取{user_type}用户 {user_data.get('username', 'unknown')} 详细信息时出错: {e}")
+        try:
+            username = user_data.get('username', user_data.get('username'))
+
+            # 确保user_data包含必要字段
+            if 'type' not in user_data:
+                user_data['type'] = user_type
+            if 'scraped_at' not in user_data:
+                user_data['scraped_at'] = self.get_current_time()
+
+            # 使用GitHubProfileScraper统一获取详细信息
+            user_info = await self.stage2_scraper._get_user_details(username, pages, user_data)
+
+            if user_info:
+                # 保留原始数据中的特殊字段（如fork特有信息）
+                for key, value in user_data.items():
+                    if key not in user_info and value:
+                        user_info[key] = value
+                logger.debug("✅ 成功获取%s用户 %s 的详细信息", user_type, username)
+                return user_info
+            else:
+                logger.warning("❌ 无法获取%s用户 %s 的详细信息", user_type, username)
                 return None
-            finally:
-                if browser:
-                    await browser.close()
+
+        except Exception as e:
+            logger.warning("获取%s用户 %s 详细信息时出错: %s", user_type, user_data.get('username', 'unknown'), e)
+            return None
 
     async def _get_users_details_unified(self, users_list: List[Dict[str, Any]], user_type: str = 'user') -> List[Dict[str, Any]]:
         """
@@ -742,27 +681,23 @@ class GitHubTwoStageScraper(BaseScraper):
         Returns:
             包含详细信息的用户列表
         """
-        print(f"🔍 使用统一Profile获取器并发获取 {len(users_list)} 个{user_type}用户的详细信息...")
-        print(f"📊 并发限制: {self.concurrent_limit} 个任务")
+        logger.debug("🔍 使用统一Profile获取器并发获取 %s 个%s用户的详细信息...", len(users_list), user_type)
+        logger.debug("📊 并发限制: %s 个任务", self.concurrent_limit)
 
-        # 启动playwright
-        from playwright.async_api import async_playwright
-        playwright = await async_playwright().start()
+        # 每个并发位置复用一个页面，而不是每个用户新建browser context
+        pages = PagePool(self.concurrent_limit, block_resources=True)
 
         try:
-            # 创建信号量限制并发数量
-            semaphore = asyncio.Semaphore(self.concurrent_limit)
-
             # 创建所有并发任务
             tasks = []
             for user_data in users_list:
                 task = asyncio.create_task(
-                    self._get_single_user_concurrent(user_data, user_type, semaphore, playwright)
+                    self._get_single_user_concurrent(user_data, user_type, pages)
                 )
                 tasks.append(task)
 
             # 并发执行所有任务，并显示进度
-            print(f"🚀 开始并发执行 {len(tasks)} 个任务...")
+            logger.debug("🚀 开始并发执行 %s 个任务...", len(tasks))
             results = []
             completed = 0
 
@@ -776,16 +711,16 @@ class GitHubTwoStageScraper(BaseScraper):
                 # 每完成10个或完成所有任务时显示进度
                 if completed % 10 == 0 or completed == len(tasks):
                     success_rate = len(results) / completed * 100 if completed > 0 else 0
-                    print(f"📈 进度: {completed}/{len(tasks)} ({completed/len(tasks)*100:.1f}%) - 成功率: {success_rate:.1f}%")
+                    logger.debug("📈 进度: %s/%s (%.1f%%) - 成功率: %.1f%%", completed, len(tasks), completed/len(tasks)*100, success_rate)
 
-            print(f"✅ {user_type}用户详细信息获取完成，成功获取 {len(results)} 个用户 (成功率: {len(results)/len(users_list)*100:.1f}%)")
+            logger.debug("✅ %s用户详细信息获取完成，成功获取 %s 个用户 (成功率: %.1f%%)", user_type, len(results), len(results)/len(users_list)*100)
             return results
 
         except Exception as e:
-            print(f"获取{user_type}用户详细信息时出错: {e}")
+            logger.warning("获取%s用户详细信息时出错: %s", user_type, e)
             return []
         finally:
-            await playwright.stop()
+            await pages.close()
 
     async def _get_users_details_unified_with_progress(self, users_list: List[Dict[str, Any]], user_type: str = 'user',
                                                      start_progress: int = 70, end_progress: int = 95):
@@ -801,8 +736,8 @@ class GitHubTwoStageScraper(BaseScraper):
         Yields:
             进度更新字典
         """
-        print(f"🔍 使用统一Profile获取器并发获取 {len(users_list)} 个{user_type}用户的详细信息...")
-        print(f"📊 并发限制: {self.concurrent_limit} 个任务")
+        logger.debug("🔍 使用统一Profile获取器并发获取 %s 个%s用户的详细信息...", len(users_list), user_type)
+        logger.debug("📊 并发限制: %s 个任务", self.concurrent_limit)
 
         yield {
             'type': 'progress',
@@ -811,24 +746,20 @@ class GitHubTwoStageScraper(BaseScraper):
             'progress': start_progress
         }
 
-        # 启动playwright
-        from playwright.async_api import async_playwright
-        playwright = await async_playwright().start()
+        # 每个并发位置复用一个页面，而不是每个用户新建browser context
+        pages = PagePool(self.concurrent_limit, block_resources=True)
 
         try:
-            # 创建信号量限制并发数量
-            semaphore = asyncio.Semaphore(self.concurrent_limit)
-
             # 创建所有并发任务
             tasks = []
             for user_data in users_list:
                 task = asyncio.create_task(
-                    self._get_single_user_concurrent(user_data, user_type, semaphore, playwright)
+                    self._get_single_user_concurrent(user_data, user_type, pages)
                 )
                 tasks.append(task)
 
             # 并发执行所有任务，并实时报告进度
-            print(f"🚀 开始并发执行 {len(tasks)} 个任务...")
+            logger.debug("🚀 开始并发执行 %s 个任务...", len(tasks))
             results = []
             completed = 0
 
@@ -857,12 +788,19 @@ class GitHubTwoStageScraper(BaseScraper):
                         'success_rate': f'{success_rate:.1f}%'
                     }
 
-            # 最终结果
+            # 最终结果分批发送；offset为0的批次表示从头替换前端已有的数据
             final_data = [self._normalize_user_data(user) for user in results]
 
+            for offset in range(0, len(final_data), RESULT_BATCH_SIZE):
+                yield {
+                    'type': 'partial',
+                    'data': final_data[offset:offset + RESULT_BATCH_SIZE],
+                    'offset': offset,
+                    'platform': 'github'
+                }
+
             yield {
                 'type': 'complete',
-                'data': final_data,
                 'total': len(final_data),
                 'message': f'并发爬取完成！共获取 {len(final_data)} 个用户的详细信息 (成功率: {len(final_data)/len(users_list)*100:.1f}%)',
                 'progress': 100,
@@ -875,11 +813,11 @@ class GitHubTwoStageScraper(BaseScraper):
                 'message': f'并发获取用户详细信息时出错: {e}'
             }
         finally:
-            await playwright.stop()
+            await pages.close()
 
     async def _get_page_single_user_concurrent(self, username: str, user_type: str, source_user: str,
-                                             source_repo: str, page_number: int, semaphore: asyncio.Semaphore,
-                                             playwright_instance) -> Dict[str, Any]:
+                                             source_repo: str, page_number: int, scraped_at: str,
+                                             pages: PagePool) -> Dict[str, Any]:
         """
         分页中的单个用户并发获取方法
 
@@ -889,90 +827,44 @@ class GitHubTwoStageScraper(BaseScraper):
             source_user: 源用户
             source_repo: 源仓库
             page_number: 页码
-            semaphore: 并发控制信号量
-            playwright_instance: Playwright实例
+            scraped_at: 本次爬取的时间戳
+            pages: 页面池，只有API不可用、需要爬取页面时才借用页面
 
         Returns:
             用户详细信息
         """
-        async with semaphore:  # 限制并发数量
-            browser = None
-            try:
-                # 为每个并发任务创建独立的browser context
-                browser = await playwright_instance.chromium.launch(headless=True)
-                context = await browser.new_context()
-                page = await context.new_page()
-
-                # 设置用户代理
-                await page.set_extra_http_headers({
-                    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-                })
-
-                # 构造标准格式的用户数据
-                user_data = {
-                    'username': username,
-                    'type': user_type,
-                    'source_user': source_user,
-                    'source_repo': source_repo,
-                    'page_number': str(page_number),
-                    'scraped_at': datetime.now().isoformat()
-                }
-
-                # 使用GitHubProfileScraper的_get_user_details方法
-                user_info = await self.stage2_scraper._get_user_details(username, page, user_data)
-                if user_info:
-                    return user_info
-                else:
-                    # 返回基本信息作为备选
-                    return {
-                        'username': username,
-                        'display_name': username,
-                        'bio': '',
-                        'avatar_url': f"https://github.com/{username}.png",
-                        'profile_url': f"https://github.com/{username}",
-                        'platform': 'github',
-                        'type': user_type,
-                        'follower_count': 0,
-                        'following_count': 0,
-                        'company': '',
-                        'location': '',
-                        'website': '',
-                        'twitter': '',
-                        'email': '',
-                        'public_repos': 0,
-                        'scraped_at': datetime.now().isoformat(),
-                        'source_user': source_user,
-                        'source_repo': source_repo,
-                        'page_number': str(page_number)
-                    }
+        # 构造标准格式的用户数据
+        user_data = {
+            'username': username,
+            'type': user_type,
+            'source_user': source_user,
+            'source_repo': source_repo,
+            'page_number': str(page_number),
+            'scraped_at': scraped_at
+        }
 
-            except Exception as e:
-                print(f"获取用户 {username} 详细信息失败: {e}")
-                # 返回基本信息
-                return {
-                    'username': username,
-                    'display_name': username,
-                    'bio': '',
-                    'avatar_url': f"https://github.com/{username}.png",
-                    'profile_url': f"https://github.com/{username}",
-                    'platform': 'github',
-                    'type': user_type,
-                    'follower_count': 0,
-                    'following_count': 0,
-                    'company': '',
-                    'location': '',
-                    'website': '',
-                    'twitter': '',
-                    'email': '',
-                    'public_repos': 0,
-                    'scraped_at': datetime.now().isoformat(),
-                    'source_user': source_user,
-                    'source_repo': source_repo,
-                    'page_number': str(page_number)
-                }
-            finally:
-                if browser:
-                    await browser.close()
+        try:
+            # 使用GitHubProfileScraper的_get_user_details方法
+            user_info = await self.stage2_scraper._get_user_details(username, pages, user_data)
+            if user_info:
+                return user_info
+        except Exception as e:
+            logger.warning("获取用户 %s 详细信息失败: %s", username, e)
+
+        # 返回基本信息作为备选
+        return self._basic_user_info(user_data)
+
+    def _basic_user_info(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
+        """获取详细资料失败时的基本用户信息，只包含用户名推导出的字段和来源信息"""
+        username = user_data['username']
+        user_info = _BASIC_USER_TEMPLATE.copy()
+        user_info.update(
+            display_name=username,
+            avatar_url=f"https://github.com/{username}.png",
+            profile_url=f"https://github.com/{username}",
+        )
+        user_info.update(user_data)
+        return user_info
 
     async def _get_page_users_details(self, usernames: List[str], page_obj, user_type: str,
                                     source_user: str, source_repo: str, page_number: int) -> List[Dict[str, Any]]:
@@ -990,29 +882,27 @@ class GitHubTwoStageScraper(BaseScraper):
         Returns:
             包含详细信息的用户列表
         """
-        print(f"🔍 并发获取第{page_number}页 {len(usernames)} 个{user_type}用户的详细信息...")
-        print(f"📊 并发限制: {self.concurrent_limit} 个任务")
+        logger.debug("🔍 并发获取第%s页 %s 个%s用户的详细信息...", page_number, len(usernames), user_type)
+        logger.debug("📊 并发限制: %s 个任务", self.concurrent_limit)
 
-        # 启动playwright实例
-        from playwright.async_api import async_playwright
-        playwright = await async_playwright().start()
+        # 每个并发位置复用一个页面，而不是每个用户新建browser context
+        pages = PagePool(self.concurrent_limit, block_resources=True)
+        # 同一页的用户共用一个时间戳
+        scraped_at = self.get_current_time()
 
         try:
-            # 创建信号量限制并发数量
-            semaphore = asyncio.Semaphore(self.concurrent_limit)
-
             # 创建所有并发任务
             tasks = []
             for username in usernames:
                 task = asyncio.create_task(
                     self._get_page_single_user_concurrent(
-                        username, user_type, source_user, source_repo, page_number, semaphore, playwright
+                        username, user_type, source_user, source_repo, page_number, scraped_at, pages
                     )
                 )
                 tasks.append(task)
 
             # 并发执行所有任务
-            print(f"🚀 开始并发执行 {len(tasks)} 个任务...")
+            logger.debug("🚀 开始并发执行 %s 个任务...", len(tasks))
             results = await asyncio.gather(*tasks, return_exceptions=True)
 
             # 过滤出成功的结果
@@ -1021,42 +911,42 @@ class GitHubTwoStageScraper(BaseScraper):
                 if isinstance(result, dict):
                     users.append(result)
                 else:
-                    print(f"任务失败: {result}")
+                    logger.warning("任务失败: %s", result)
 
-            print(f"✅ 第{page_number}页用户详细信息获取完成，成功获取 {len(users)} 个用户")
+            logger.debug("✅ 第%s页用户详细信息获取完成，成功获取 %s 个用户", page_number, len(users))
             return users
 
         except Exception as e:
-            print(f"获取第{page_number}页用户详细信息时出错: {e}")
+            logger.warning("获取第%s页用户详细信息时出错: %s", page_number, e)
             return []
         finally:
-            await playwright.stop()
+            await pages.close()
 
     async def scrape_page(self, url: str, page: int = 1) -> Dict:
         """分页爬取方法"""
         try:
-            print(f"GitHub分页爬取器收到URL: {url}, 页码: {page}")
+            logger.debug("GitHub分页爬取器收到URL: %s, 页码: %s", url, page)
 
             # 解析URL确定爬取类型
             scrape_type, target_user, target_repo = self._parse_url_type(url)
 
             if scrape_type == "followers":
-                print(f"识别为followers页面，第{page}页")
-                return await self._scrape_followers_page(url, page)
+                logger.debug("识别为followers页面，第%s页", page)
+                return await self._scrape_followers_page(url, target_user, page)
             elif scrape_type == "stargazers":
-                print(f"识别为stargazers页面，第{page}页")
+                logger.debug("识别为stargazers页面，第%s页", page)
                 return await self._scrape_stargazers_page(url, target_user, target_repo, page)
             elif scrape_type == "forks":
-                print(f"识别为forks页面，第{page}页")
+                logger.debug("识别为forks页面，第%s页", page)
                 # forks不支持分页模式，返回错误
                 raise ValueError("Forks爬取不支持分页模式，请使用完整爬取方法")
             elif scrape_type == "user":
-                print(f"识别为用户页面: {target_user}，第{page}页")
+                logger.debug("识别为用户页面: %s，第%s页", target_user, page)
                 # 默认爬取用户的followers
                 followers_url = f"https://github.com/{target_user}?tab=followers"
-                return await self._scrape_followers_page(followers_url, page)
+                return await self._scrape_followers_page(followers_url, target_user, page)
             elif scrape_type == "repo":
-                print(f"识别为Repositories页面: {target_user}/{target_repo}，第{page}页")
+                logger.debug("识别为Repositories页面: %s/%s，第%s页", target_user, target_repo, page)
                 # 默认爬取Repositories的stargazers
                 stargazers_url = f"https://github.com/{target_user}/{target_repo}/stargazers"
                 return await self._scrape_stargazers_page(stargazers_url, target_user, target_repo, page)
@@ -1064,118 +954,44 @@ class GitHubTwoStageScraper(BaseScraper):
                 raise ValueError(f"无法识别的URL类型: {url}")
 
         except Exception as e:
-            print(f"GitHub分页爬取失败: {e}")
+            logger.warning("GitHub分页爬取失败: %s", e)
             raise e
 
-    async def _scrape_followers_page(self, url: str, page: int) -> Dict:
+    async def _scrape_followers_page(self, url: str, owner: str, page: int) -> Dict:
         """分页爬取followers"""
         try:
-            print(f"开始爬取关注者页面第{page}页: {url}")
+            logger.debug("开始爬取关注者页面第%s页: %s", page, url)
+
+            # 构建分页URL
+            if '?' in url:
+                page_url = f"{url}&page={page}"
+            else:
+                page_url = f"{url}?page={page}"
 
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                context = await browser.new_context()
-                page_obj = await context.new_page()
+            usernames, has_next_page = await self._list_page_usernames(f'/users/{owner}/followers', page_url, page)
 
-                try:
-                    # 构建分页URL
-                    if '?' in url:
-                        page_url = f"{url}&page={page}"
-                    else:
-                        page_url = f"{url}?page={page}"
-
-                    print(f"访问分页URL: {page_url}")
-                    await page_obj.goto(page_url, wait_until='networkidle', timeout=30000)
-
-                    # 等待用户列表加载
-                    await page_obj.wait_for_selector('a[data-hovercard-type="user"]', timeout=10000)
-
-                    # 获取用户链接
-                    user_links = await page_obj.query_selector_all('a[data-hovercard-type="user"]')
-                    print(f"找到 {len(user_links)} 个用户链接元素")
-
-                    # 提取用户名列表，使用set去重
-                    usernames = []
-                    seen_usernames = set()
-                    for link in user_links:
-                        try:
-                            href = await link.get_attribute('href')
-                            if href and href.startswith('/'):
-                                username = href.strip('/')
-                                # 去重：如果用户名已经存在，跳过
-                                if username and username not in seen_usernames:
-                                    seen_usernames.add(username)
-                                    usernames.append(username)
-
-                                    # 限制每页最多50个用户
-                                    if len(usernames) >= 50:
-                                        break
-                        except Exception as e:
-                            print(f"提取用户名失败: {e}")
-                            continue
-
-                    print(f"开始获取 {len(usernames)} 个用户的详细信息...")
-
-                    # 使用统一的Profile获取器
-                    users = await self._get_page_users_details(usernames, page_obj, 'follower', '', '', page)
-
-                    # 按follower数量排序（降序）
-                    users.sort(key=lambda x: x['follower_count'], reverse=True)
-                    print(f"用户按follower数量排序完成，最高: {users[0]['follower_count'] if users else 0}")
-
-                    # 检查是否有下一页 - 使用多种策略
-                    has_next_page = False
-                    try:
-                        # GitHub可能使用不同的分页选择器
-                        selectors_to_check = [
-                            '.pagination a[rel="next"]',
-                            '.paginate-container .next_page',
-                            '.paginate-container a[rel="next"]',
-                            'a[aria-label="Next"]',
-                            '.BtnGroup a[rel="next"]',
-                            '.pagination .next_page:not(.disabled)',
-                            '.paginate-container .next_page:not(.disabled)'
-                        ]
-
-                        for selector in selectors_to_check:
-                            next_button = await page_obj.query_selector(selector)
-                            if next_button:
-                                # 检查按钮是否被禁用
-                                is_disabled = await next_button.get_attribute('aria-disabled')
-                                class_name = await next_button.get_attribute('class') or ''
-                                if is_disabled != 'true' and 'disabled' not in class_name:
-                                    has_next_page = True
-                                    print(f"找到有效的下一页按钮: {selector}")
-                                    break
-
-                        # 如果没有找到明确的下一页按钮，检查当前页面的用户数量
-                        # 如果正好是50个用户，很可能还有下一页
-                        if not has_next_page and len(users) >= 50:
-                            has_next_page = True
-                            print(f"基于用户数量({len(users)})判断可能有下一页")
-
-                    except Exception as e:
-                        print(f"检查下一页时出错: {e}")
-                        # 如果出错且用户数量达到50，假设有下一页
-                        if len(users) >= 50:
-                            has_next_page = True
-
-                    # 统一格式化数据
-                    users = [self._normalize_user_data(user, 'follower') for user in users]
-
-                    print(f"成功提取了第{page}页 {len(users)} 个关注者")
-
-                    return {
-                        'data': users,
-                        'has_next_page': has_next_page,
-                        'current_page': page
-                    }
+            logger.debug("开始获取 %s 个用户的详细信息...", len(usernames))
 
-                finally:
-                    await browser.close()
+            # 使用统一的Profile获取器，详情页由其内部的页面池并发获取
+            users = await self._get_page_users_details(usernames, None, 'follower', '', '', page)
+
+            # 按follower数量排序（降序）
+            users.sort(key=lambda x: x['follower_count'], reverse=True)
+            logger.debug("用户按follower数量排序完成，最高: %s", users[0]['follower_count'] if users else 0)
+
+            # 统一格式化数据
+            users = [self._normalize_user_data(user, 'follower') for user in users]
+
+            logger.debug("成功提取了第%s页 %s 个关注者", page, len(users))
+
+            return {
+                'data': users,
+                'has_next_page': has_next_page,
+                'current_page': page
+            }
 
         except Exception as e:
-            print(f"爬取followers第{page}页时出错: {e}")
+            logger.warning("爬取followers第%s页时出错: %s", page, e)
             return {
                 'data': [],
                 'has_next_page': False,
@@ -1185,111 +1001,85 @@ class GitHubTwoStageScraper(BaseScraper):
     async def _scrape_stargazers_page(self, url: str, owner: str, repo: str, page: int) -> Dict:
         """分页爬取stargazers"""
         try:
-            print(f"开始爬取stargazers页面第{page}页: {url}")
+            logger.debug("开始爬取stargazers页面第%s页: %s", page, url)
 
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                context = await browser.new_context()
-                page_obj = await context.new_page()
+            # 构建分页URL
+            page_url = f"{url}?page={page}"
 
-                try:
-                    # 构建分页URL
-                    page_url = f"{url}?page={page}"
-
-                    print(f"访问分页URL: {page_url}")
-                    await page_obj.goto(page_url, wait_until='networkidle', timeout=30000)
-
-                    # 等待用户列表加载
-                    await page_obj.wait_for_selector('a[data-hovercard-type="user"]', timeout=10000)
-
-                    # 获取用户链接
-                    user_links = await page_obj.query_selector_all('a[data-hovercard-type="user"]')
-                    print(f"找到 {len(user_links)} 个用户链接元素")
-
-                    # 提取用户名列表，使用set去重
-                    usernames = []
-                    seen_usernames = set()
-                    for link in user_links:
-                        try:
-                            href = await link.get_attribute('href')
-                            if href and href.startswith('/'):
-                                username = href.strip('/')
-                                # 去重：如果用户名已经存在，跳过
-                                if username and username not in seen_usernames:
-                                    seen_usernames.add(username)
-                                    usernames.append(username)
-
-                                    # 限制每页最多50个用户
-                                    if len(usernames) >= 50:
-                                        break
-                        except Exception as e:
-                            print(f"提取用户名失败: {e}")
-                            continue
-
-                    print(f"开始获取 {len(usernames)} 个用户的详细信息...")
-
-                    # 使用统一的Profile获取器
-                    users = await self._get_page_users_details(usernames, page_obj, 'stargazer', owner, repo, page)
-
-                    # 按follower数量排序（降序）
-                    users.sort(key=lambda x: x['follower_count'], reverse=True)
-                    print(f"用户按follower数量排序完成，最高: {users[0]['follower_count'] if users else 0}")
-
-                    # 检查是否有下一页 - 使用多种策略
-                    has_next_page = False
-                    try:
-                        # GitHub可能使用不同的分页选择器
-                        selectors_to_check = [
-                            '.pagination a[rel="next"]',
-                            '.paginate-container .next_page',
-                            '.paginate-container a[rel="next"]',
-                            'a[aria-label="Next"]',
-                            '.BtnGroup a[rel="next"]',
-                            '.pagination .next_page:not(.disabled)',
-                            '.paginate-container .next_page:not(.disabled)'
-                        ]
-
-                        for selector in selectors_to_check:
-                            next_button = await page_obj.query_selector(selector)
-                            if next_button:
-                                # 检查按钮是否被禁用
-                                is_disabled = await next_button.get_attribute('aria-disabled')
-                                class_name = await next_button.get_attribute('class') or ''
-                                if is_disabled != 'true' and 'disabled' not in class_name:
-                                    has_next_page = True
-                                    print(f"找到有效的下一页按钮: {selector}")
-                                    break
-
-                        # 如果没有找到明确的下一页按钮，检查当前页面的用户数量
-                        # 如果正好是50个用户，很可能还有下一页
-                        if not has_next_page and len(users) >= 50:
-                            has_next_page = True
-                            print(f"基于用户数量({len(users)})判断可能有下一页")
-
-                    except Exception as e:
-                        print(f"检查下一页时出错: {e}")
-                        # 如果出错且用户数量达到50，假设有下一页
-                        if len(users) >= 50:
-                            has_next_page = True
-
-                    # 统一格式化数据
-                    users = [self._normalize_user_data(user, 'stargazer') for user in users]
-
-                    print(f"成功提取了第{page}页 {len(users)} 个stargazers")
-
-                    return {
-                        'data': users,
-                        'has_next_page': has_next_page,
-                        'current_page': page
-                    }
+            usernames, has_next_page = await self._list_page_usernames(f'/repos/{owner}/{repo}/stargazers', page_url, page)
+
+            logger.debug("开始获取 %s 个用户的详细信息...", len(usernames))
+
+            # 使用统一的Profile获取器，详情页由其内部的页面池并发获取
+            users = await self._get_page_users_details(usernames, None, 'stargazer', owner, repo, page)
+
+            # 按follower数量排序（降序）
+            users.sort(key=lambda x: x['follower_count'], reverse=True)
+            logger.debug("用户按follower数量排序完成，最高: %s", users[0]['follower_count'] if users else 0)
 
-                finally:
-                    await browser.close()
+            # 统一格式化数据
+            users = [self._normalize_user_data(user, 'stargazer') for user in users]
+
+            logger.debug("成功提取了第%s页 %s 个stargazers", page, len(users))
+
+            return {
+                'data': users,
+                'has_next_page': has_next_page,
+                'current_page': page
+            }
 
         except Exception as e:
-            print(f"爬取stargazers第{page}页时出错: {e}")
+            logger.warning("爬取stargazers第%s页时出错: %s", page, e)
             return {
                 'data': [],
                 'has_next_page': False,
                 'current_page': page
-            }
\ No newline at end of file
+            }
+
+    async def _list_page_usernames(self, api_path: str, page_url: str, page: int) -> Tuple[List[str], bool]:
+        """获取分页列表中一页的用户名
+
+        优先请求REST API（每页50个，与网页分页一致），API不可用时才打开网页读取
+
+        Returns:
+            (用户名列表, 是否有下一页)
+        """
+        try:
+            return await list_users_page(api_path, page)
+        except GitHubAPIError as e:
+            logger.debug("API获取第%s页用户列表失败，回退到页面爬取: %s", page, e)
+
+        context = await new_context(block_resources=True)
+        try:
+            page_obj = await context.new_page()
+
+            logger.debug("访问分页URL: %s", page_url)
+            await page_obj.goto(page_url, wait_until='domcontentloaded', timeout=30000)
+
+            # 等待用户列表加载
+            await page_obj.wait_for_selector('a[data-hovercard-type="user"]', timeout=10000)
+
+            # 获取用户链接
+            user_links = await page_obj.eval_on_selector_all('a[data-hovercard-type="user"]', 'els => els.map(e => e.getAttribute("href"))')
+            logger.debug("找到 %s 个用户链接元素", len(user_links))
+
+            # 提取用户名列表，使用set去重
+            usernames = []
+            seen_usernames = set()
+            for href in user_links:
+                if href and href.startswith('/'):
+                    username = href.strip('/')
+                    # 去重：如果用户名已经存在，跳过
+                    if username and username not in seen_usernames:
+                        seen_usernames.add(username)
+                        usernames.append(username)
+
+                        # 限制每页最多50个用户
+                        if len(usernames) >= 50:
+                            break
+        finally:
+            # 列表页读取完毕即关闭，获取详情期间不再占用一个渲染进程
+            await context.close()
+
+        # GitHub每页固定50个用户，不满50个就是最后一页，无需再查询下一页按钮
+        return usernames, len(usernames) >= 50
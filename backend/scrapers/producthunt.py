@@ -1,7 +1,10 @@
+import logging
 import re
 from typing import List, Dict, Any
 from .base import BaseScraper
 
+logger = logging.getLogger(__name__)
+
 class ProductHuntScraper(BaseScraper):
     """Product Hunt爬取器"""
     
@@ -23,7 +26,7 @@ class ProductHuntScraper(BaseScraper):
     
     async def _scrape_product_voters(self, url: str) -> List[Dict[str, Any]]:
         """爬取产品的投票者"""
-        await self.page.goto(url)
+        await self.page.goto(url, wait_until='domcontentloaded')
         
         # 等待页面加载
         await self.wait_for_element('[data-test="vote-button"]', timeout=15000)
@@ -32,7 +35,6 @@ class ProductHuntScraper(BaseScraper):
         vote_button = await self.page.query_selector('[data-test="vote-button"]')
         if vote_button:
             await vote_button.click()
-            await self.page.wait_for_timeout(2000)
         
         # 等待投票者列表加载
         await self.wait_for_element('[data-test="voter-item"]', timeout=10000)
@@ -82,14 +84,14 @@ class ProductHuntScraper(BaseScraper):
                     })
             
             except Exception as e:
-                print(f"提取Product Hunt投票者信息时出错: {e}")
+                logger.warning("提取Product Hunt投票者信息时出错: %s", e)
                 continue
         
         return voters
     
     async def _scrape_user_activity(self, url: str) -> List[Dict[str, Any]]:
         """爬取用户的活动信息"""
-        await self.page.goto(url)
+        await self.page.goto(url, wait_until='domcontentloaded')
         
         # 等待用户页面加载
         await self.wait_for_element('.user-profile', timeout=15000)
@@ -144,6 +146,6 @@ class ProductHuntScraper(BaseScraper):
                 })
         
         except Exception as e:
-            print(f"提取Product Hunt用户信息时出错: {e}")
+            logger.warning("提取Product Hunt用户信息时出错: %s", e)
         
         return user_info 
\ No newline at end of file
@@ -1,8 +1,11 @@
+import logging
 import re
 from datetime import datetime
 from typing import List, Dict, Any
 from .base import BaseScraper
 
+logger = logging.getLogger(__name__)
+
 class TwitterScraper(BaseScraper):
     """Twitter/X爬取器"""
     
@@ -29,7 +32,7 @@ class TwitterScraper(BaseScraper):
     
     async def _scrape_followers(self, url: str) -> List[Dict[str, Any]]:
         """爬取用户的关注者"""
-        await self.page.goto(url)
+        await self.page.goto(url, wait_until='domcontentloaded')
         
         # 等待内容加载
         if not await self.wait_for_element('[data-testid="UserCell"]', timeout=15000):
@@ -95,14 +98,14 @@ class TwitterScraper(BaseScraper):
                     })
             
             except Exception as e:
-                print(f"提取Twitter关注者信息时出错: {e}")
+                logger.warning("提取Twitter关注者信息时出错: %s", e)
                 continue
         
         return followers
     
     async def _scrape_following(self, url: str) -> List[Dict[str, Any]]:
         """爬取用户关注的人"""
-        await self.page.goto(url)
+        await self.page.goto(url, wait_until='domcontentloaded')
         
         # 等待内容加载
         if not await self.wait_for_element('[data-testid="UserCell"]', timeout=15000):
@@ -168,7 +171,7 @@ class TwitterScraper(BaseScraper):
                     })
             
             except Exception as e:
-                print(f"提取Twitter关注信息时出错: {e}")
+                logger.warning("提取Twitter关注信息时出错: %s", e)
                 continue
         
         return following 
\ No newline at end of file
@@ -1,7 +1,10 @@
+import logging
 import re
 from typing import List, Dict, Any
 from .base import BaseScraper
 
+logger = logging.getLogger(__name__)
+
 class WeiboScraper(BaseScraper):
     """微博爬取器"""
     
@@ -28,7 +31,7 @@ class WeiboScraper(BaseScraper):
     
     async def _scrape_fans(self, url: str) -> List[Dict[str, Any]]:
         """爬取用户的粉丝"""
-        await self.page.goto(url)
+        await self.page.goto(url, wait_until='domcontentloaded')
         
         # 等待内容加载
         await self.wait_for_element('.card-wrap', timeout=15000)
@@ -71,14 +74,14 @@ class WeiboScraper(BaseScraper):
                     })
             
             except Exception as e:
-                print(f"提取微博粉丝信息时出错: {e}")
+                logger.warning("提取微博粉丝信息时出错: %s", e)
                 continue
         
         return fans
     
     async def _scrape_following(self, url: str) -> List[Dict[str, Any]]:
         """爬取用户关注的人"""
-        await self.page.goto(url)
+        await self.page.goto(url, wait_until='domcontentloaded')
         
         # 等待内容加载
         await self.wait_for_element('.card-wrap', timeout=15000)
@@ -121,7 +124,7 @@ class WeiboScraper(BaseScraper):
                     })
             
             except Exception as e:
-                print(f"提取微博关注信息时出错: {e}")
+                logger.warning("提取微博关注信息时出错: %s", e)
                 continue
         
         return following 
\ No newline at end of file
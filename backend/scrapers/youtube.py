@@ -1,7 +1,10 @@
+import logging
 import re
 from typing import List, Dict, Any
 from .base import BaseScraper
 
+logger = logging.getLogger(__name__)
+
 class YouTubeScraper(BaseScraper):
     """YouTube爬取器"""
     
@@ -23,14 +26,15 @@ class YouTubeScraper(BaseScraper):
     
     async def _scrape_video_comments(self, url: str) -> List[Dict[str, Any]]:
         """爬取视频评论"""
-        await self.page.goto(url)
+        await self.page.goto(url, wait_until='domcontentloaded')
         
         # 等待页面加载
         await self.wait_for_element('#comments', timeout=15000)
         
         # 滚动到评论区
         await self.page.evaluate("document.querySelector('#comments').scrollIntoView()")
-        await self.page.wait_for_timeout(3000)
+        # 评论在滚动到可见后才开始加载，等到第一条评论出现即可
+        await self.wait_for_element('#comments ytd-comment-thread-renderer', timeout=15000)
         
         # 滚动加载更多评论
         await self.scroll_to_load_more(max_scrolls=15)
@@ -73,14 +77,14 @@ class YouTubeScraper(BaseScraper):
                     })
             
             except Exception as e:
-                print(f"提取YouTube评论信息时出错: {e}")
+                logger.warning("提取YouTube评论信息时出错: %s", e)
                 continue
         
         return comments
     
     async def _scrape_channel_info(self, url: str) -> List[Dict[str, Any]]:
         """爬取频道信息"""
-        await self.page.goto(url)
+        await self.page.goto(url, wait_until='domcontentloaded')
         
         # 等待频道页面加载
         await self.wait_for_element('#channel-header', timeout=15000)
@@ -122,6 +126,6 @@ class YouTubeScraper(BaseScraper):
                 })
         
         except Exception as e:
-            print(f"提取YouTube频道信息时出错: {e}")
+            logger.warning("提取YouTube频道信息时出错: %s", e)
         
         return channel_info 
\ No newline at end of file
@@ -83,6 +83,73 @@ export default function Home() {
       const decoder = new TextDecoder()
       let buffer = ''
 
+      // 处理单条流式消息
+      const handleStreamMessage = (data: any) => {
+        switch (data.type) {
+          case 'start':
+          case 'platform':
+          case 'progress':
+            setStreamingStatus(prev => ({
+              ...prev,
+              message: data.message,
+              progress: data.progress || prev.progress,
+              stage: data.stage,
+              currentUser: data.current_user,
+              processedCount: data.processed_count,
+              totalCount: data.total_count,
+            }))
+            break
+
+          case 'user_completed':
+            if (data.user_data) {
+              setStreamingData(prev => [...prev, data.user_data])
+            }
+            setStreamingStatus(prev => ({
+              ...prev,
+              message: data.message,
+              progress: data.progress || prev.progress,
+              currentUser: data.current_user,
+              processedCount: data.processed_count,
+              totalCount: data.total_count,
+            }))
+            break
+
+          case 'stopped':
+            setStreamingStatus(prev => ({
+              ...prev,
+              isStreaming: false,
+              message: data.message,
+            }))
+            break
+
+          case 'partial':
+            // 最终结果分批到达，第一批替换逐个用户累积的数据
+            setStreamingData(prev => [...(data.offset ? prev : []), ...(data.data || [])])
+            break
+
+          case 'complete':
+            // GitHub的最终结果已通过partial分批发送，complete中不再携带数据
+            if (data.data) {
+              setStreamingData(data.data)
+            }
+            setStreamingStatus({
+              isStreaming: false,
+              progress: 100,
+              message: data.message,
+            })
+            break
+
+          case 'error':
+            setError(data.message)
+            setStreamingStatus({
+              isStreaming: false,
+              progress: 0,
+              message: '',
+            })
+            break
+        }
+      }
+
       while (true) {
         const { done, value } = await reader.read()
 
@@ -98,60 +165,11 @@ export default function Home() {
             try {
               const data = JSON.parse(line.slice(6))
 
-              switch (data.type) {
-                case 'start':
-                case 'platform':
-                case 'progress':
-                  setStreamingStatus(prev => ({
-                    ...prev,
-                    message: data.message,
-                    progress: data.progress || prev.progress,
-                    stage: data.stage,
-                    currentUser: data.current_user,
-                    processedCount: data.processed_count,
-                    totalCount: data.total_count,
-                  }))
-                  break
-
-                case 'user_completed':
-                  if (data.user_data) {
-                    setStreamingData(prev => [...prev, data.user_data])
-                  }
-                  setStreamingStatus(prev => ({
-                    ...prev,
-                    message: data.message,
-                    progress: data.progress || prev.progress,
-                    currentUser: data.current_user,
-                    processedCount: data.processed_count,
-                    totalCount: data.total_count,
-                  }))
-                  break
-
-                case 'stopped':
-                  setStreamingStatus(prev => ({
-                    ...prev,
-                    isStreaming: false,
-                    message: data.message,
-                  }))
-                  break
-
-                case 'complete':
-                  setStreamingData(data.data || [])
-                  setStreamingStatus({
-                    isStreaming: false,
-                    progress: 100,
-                    message: data.message,
-                  })
-                  break
-
-                case 'error':
-                  setError(data.message)
-                  setStreamingStatus({
-                    isStreaming: false,
-                    progress: 0,
-                    message: '',
-                  })
-                  break
+              // 后端会把短时间内的多条消息合并为batch
+              if (data.type === 'batch') {
+                data.events.forEach(handleStreamMessage)
+              } else {
+                handleStreamMessage(data)
               }
             } catch (e) {
               console.error('解析数据时出错:', e)